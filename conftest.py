@@ -0,0 +1 @@
+# lets pytest import the noughts package from a checkout without installing it
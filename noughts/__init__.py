@@ -0,0 +1,8 @@
+# headless game engine; the pygame window lives in noughts.gui and is only
+# imported by the windowed entry point
+from .board import BitBoard, GameBoard, WinLines, gamevariables, winlines, zobristkeys
+from .book import OpeningBook, bookmove, openingbook
+from .exact import ExactSearch, exactsearch
+from .evaluate import batchendgame, evaluatepositions
+from .rollout import batchrollout, localrollout, threatrollout
+from .search import Negamax, NodeStore, ParallelUCT, SearchBudget, SearchStats, SearchTree, TranspositionTable, UCT, UCTsearch
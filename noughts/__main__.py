@@ -0,0 +1,3 @@
+from .gui import main
+
+main()
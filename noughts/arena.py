@@ -0,0 +1,171 @@
+import argparse
+import concurrent.futures
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from .board import BitBoard, gamevariables
+from .records import appendgames
+from .search import Negamax, SearchBudget, SearchTree, TranspositionTable, UCT
+
+
+class RandomEngine():
+  def move(self, board):
+    positions = board.availablepositions()
+    return tuple(positions[:, random.randrange(0, positions.shape[1])])
+
+
+class UCTEngine():
+  def __init__(self, ms = None, iterations = None, rollouts = 1, table = 0, reuse = 1, book = 1, exact = 1, threats = 0):
+    if ms is None and iterations is None:
+      iterations = 1000
+    self.budget = SearchBudget(ms, iterations)
+    self.rollouts = rollouts
+    self.tree = SearchTree() if reuse else None
+    self.table = TranspositionTable(table) if table else None
+    self.usebook = bool(book)
+    self.useexact = bool(exact)
+    self.rolloutpolicy = "threat" if threats else "uniform"
+
+  def move(self, board):
+    return UCT(board, self.budget, self.rollouts, self.tree, self.table, usebook = self.usebook, useexact = self.useexact, rolloutpolicy = self.rolloutpolicy)
+
+
+class NegamaxEngine():
+  # exact search only, for two player games
+  def __init__(self, ms = None, nodes = None):
+    if ms is None and nodes is None:
+      ms = 1000
+    self.budget = SearchBudget(ms, nodes)
+
+  def move(self, board):
+    return Negamax(board, self.budget)
+
+
+enginetypes = {
+  "random": RandomEngine,
+  "uct": UCTEngine,
+  "negamax": NegamaxEngine,
+}
+
+
+def parseengine(spec):
+  # "uct:ms=100,rollouts=8" -> ("uct", {"ms": 100, "rollouts": 8})
+  name, _, options = spec.partition(":")
+  if name not in enginetypes:
+    raise argparse.ArgumentTypeError("unknown engine {!r}, choose from {}".format(name, ", ".join(enginetypes)))
+  settings = {}
+  for option in filter(None, options.split(",")):
+    key, _, value = option.partition("=")
+    try:
+      settings[key] = int(value)
+    except ValueError:
+      raise argparse.ArgumentTypeError("engine option {!r} needs an integer value".format(option))
+  return spec, name, settings
+
+
+def playgame(task):
+  # plays one game in a worker; seat s is played by engine
+  # (s + gameindex) % len(engines) so every engine takes every seat
+  gameindex, boardsize, winlinelen, numplayers, engines, seed = task
+  random.seed(seed)
+  np.random.seed(seed % 2 ** 32)
+  board = BitBoard(gamevariables(boardsize, winlinelen, numplayers))
+  seats = [(seat + gameindex) % len(engines) for seat in range(0, numplayers)]
+  players = [enginetypes[engines[index][1]](**engines[index][2]) for index in seats]
+  movetime = [0.0] * numplayers
+  movecount = [0] * numplayers
+  while board.endgame() < 0:
+    seat = board.turnnum
+    start = time.perf_counter()
+    move = players[seat].move(board)
+    movetime[seat] += time.perf_counter() - start
+    movecount[seat] += 1
+    board.makenextplay(move)
+  return {"seats": seats, "winner": board.endgame(), "moves": len(board.moves), "movelist": board.moves,
+          "movetime": movetime, "movecount": movecount}
+
+
+def runarena(games, boardsize, winlinelen, numplayers, engines, workers = None, seed = None, record = None):
+  seeds = random.Random(seed)
+  tasks = [(gameindex, boardsize, winlinelen, numplayers, engines, seeds.getrandbits(63)) for gameindex in range(0, games)]
+  start = time.perf_counter()
+  with concurrent.futures.ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+    results = list(pool.map(playgame, tasks, chunksize = max(1, games // (4 * (workers or os.cpu_count())))))
+  elapsed = time.perf_counter() - start
+  if record:
+    appendgames(record, ({"boardsize": boardsize, "winlinelen": winlinelen, "numplayers": numplayers, "winner": result["winner"],
+                          "humanturnnums": [], "moves": result["movelist"]} for result in results))
+
+  # label repeated specs apart so self-play keeps both sides
+  labels = []
+  for index, (spec, name, settings) in enumerate(engines):
+    labels.append(spec if spec not in labels else "{} #{}".format(spec, index + 1))
+  summary = {label: {"games": 0, "wins": 0, "draws": 0, "losses": 0, "moves": 0, "movetime": 0.0} for label in labels}
+  draws = 0
+  for result in results:
+    if result["winner"]  ==  0:
+      draws += 1
+    for seat, index in enumerate(result["seats"]):
+      stats = summary[labels[index]]
+      stats["games"] += 1
+      if result["winner"]  ==  0:
+        stats["draws"] += 1
+      elif result["winner"]  ==  seat + 1:
+        stats["wins"] += 1
+      else:
+        stats["losses"] += 1
+      stats["moves"] += result["movecount"][seat]
+      stats["movetime"] += result["movetime"][seat]
+  for stats in summary.values():
+    stats["winrate"] = stats["wins"] / stats["games"] if stats["games"] else 0.0
+    stats["drawrate"] = stats["draws"] / stats["games"] if stats["games"] else 0.0
+    stats["mspermove"] = 1000 * stats["movetime"] / stats["moves"] if stats["moves"] else 0.0
+  return {
+    "games": games,
+    "boardsize": boardsize,
+    "winlinelen": winlinelen,
+    "numplayers": numplayers,
+    "seconds": elapsed,
+    "gamespersecond": games / elapsed,
+    "drawrate": draws / games,
+    "averagemoves": sum(result["moves"] for result in results) / games,
+    "engines": summary,
+  }
+
+
+def printreport(report):
+  print("{games} games on {boardsize}x{boardsize}, line {winlinelen}, {numplayers} players in {seconds:.1f}s "
+        "({gamespersecond:.2f} games/s, {averagemoves:.1f} moves/game, {drawrate:.1%} drawn)".format(**report))
+  print("{:<32} {:>6} {:>6} {:>6} {:>6} {:>7} {:>7} {:>9}".format("engine", "games", "wins", "draws", "losses", "win%", "draw%", "ms/move"))
+  for spec, stats in report["engines"].items():
+    print("{:<32} {games:>6} {wins:>6} {draws:>6} {losses:>6} {winrate:>7.1%} {drawrate:>7.1%} {mspermove:>9.2f}".format(spec, **stats))
+
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(prog = "python -m noughts.arena", description = "Play headless games between engine configurations.")
+  parser.add_argument("--games", type = int, default = 100)
+  parser.add_argument("--width", type = int, default = 3, help = "board width")
+  parser.add_argument("--line", type = int, default = 3, help = "winning line length")
+  parser.add_argument("--players", type = int, default = 2)
+  parser.add_argument("--engine", dest = "engines", type = parseengine, action = "append",
+                      help = "engine spec such as random, negamax:ms=500 or uct:ms=100,rollouts=8,table=65536,reuse=1,book=1,exact=1,threats=0; repeat for each contestant")
+  parser.add_argument("--workers", type = int, default = None, help = "worker processes, default one per core")
+  parser.add_argument("--seed", type = int, default = None)
+  parser.add_argument("--record", help = "append the games to this game log")
+  parser.add_argument("--json", action = "store_true", help = "print the report as JSON")
+  args = parser.parse_args(argv)
+  engines = args.engines or [parseengine("uct:iterations=1000"), parseengine("random")]
+
+  report = runarena(args.games, args.width, args.line, args.players, engines, args.workers, args.seed, args.record)
+  if args.json:
+    print(json.dumps(report, indent = 2))
+  else:
+    printreport(report)
+
+
+if __name__  ==  "__main__":
+  main()
@@ -0,0 +1,168 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+from .board import BitBoard, GameBoard, gamevariables
+from .search import SearchBudget, UCTsearch
+
+
+backends = {"string": GameBoard, "bitboard": BitBoard}
+
+
+def rate(function, mintime):
+  # calls per second, doubling the batch until a batch takes mintime
+  batch = 1
+  while True:
+    start = time.perf_counter()
+    for i in range(batch):
+      function()
+    elapsed = time.perf_counter() - start
+    if elapsed >= mintime:
+      return batch / elapsed
+    batch *= 2
+
+
+def midgame(backend, boardsize, winlinelen, numplayers, seed):
+  # a reproducible position about half full that nobody has won yet
+  generator = random.Random(seed)
+  board = backend(gamevariables(boardsize, winlinelen, numplayers))
+  for step in range(0, boardsize ** 2 // 2):
+    positions = list(zip(*board.availablepositions()))
+    generator.shuffle(positions)
+    for position in positions:
+      trial = board.clone()
+      trial.makenextplay(position)
+      if trial.endgame() < 0:
+        board = trial
+        break
+    else:
+      break
+  return board
+
+
+def benchboard(backend, boardsize, winlinelen, numplayers, mintime, seed):
+  board = midgame(backends[backend], boardsize, winlinelen, numplayers, seed)
+  moves = list(zip(*board.availablepositions()))
+  cycle = iter([])
+
+  def makenextplay():
+    nonlocal cycle
+    move = next(cycle, None)
+    if move is None:
+      cycle = iter(moves)
+      move = next(cycle)
+    board.clone().makenextplay(move)
+
+  return {
+    "clone": rate(board.clone, mintime),
+    "makenextplay": rate(makenextplay, mintime),
+    "availablepositions": rate(board.availablepositions, mintime),
+    "endgame": rate(board.endgame, mintime),
+  }
+
+
+def benchsearch(boardsize, winlinelen, numplayers, mintime, seed):
+  random.seed(seed)
+  np.random.seed(seed)
+  board = midgame(BitBoard, boardsize, winlinelen, numplayers, seed)
+  start = time.perf_counter()
+  tree = UCTsearch(board, SearchBudget(milliseconds = 1000 * mintime))
+  iterations = tree.store.visits[tree.root] / (time.perf_counter() - start)
+  store = tree.store
+  if store.firstchild[tree.root] >= 0 and store.untried[tree.root]  ==  0:
+    select = rate(lambda: store.select(tree.root), mintime)
+  else:
+    # the root still has untried moves, so select the deepest fully
+    # expanded node instead
+    expanded = np.flatnonzero((store.firstchild[:store.count] >= 0) & (store.untried[:store.count]  ==  0))
+    select = rate(lambda: store.select(expanded[0]), mintime) if expanded.size else None
+  return {"select": select, "uctiterations": iterations}
+
+
+def runbenchmarks(widths, lines, players, mintime, seed = 0):
+  results = []
+  for boardsize in widths:
+    for winlinelen in lines:
+      for numplayers in players:
+        config = {"boardsize": boardsize, "winlinelen": winlinelen, "numplayers": numplayers}
+        for backend in backends:
+          for name, value in benchboard(backend, boardsize, winlinelen, numplayers, mintime, seed).items():
+            results.append(dict(config, benchmark = name, backend = backend, persecond = value))
+        for name, value in benchsearch(boardsize, winlinelen, numplayers, mintime, seed).items():
+          if value is not None:
+            results.append(dict(config, benchmark = name, backend = "bitboard", persecond = value))
+  return {
+    "python": platform.python_version(),
+    "numpy": np.__version__,
+    "machine": platform.machine(),
+    "platform": platform.platform(),
+    "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    "mintime": mintime,
+    "results": results,
+  }
+
+
+def resultkey(result):
+  return (result["benchmark"], result["backend"], result["boardsize"], result["winlinelen"], result["numplayers"])
+
+
+def compare(report, baseline, tolerance):
+  # ratio of each result to the matching baseline result, with the ones
+  # slower than the tolerance allows
+  before = {resultkey(result): result["persecond"] for result in baseline["results"]}
+  ratios = []
+  for result in report["results"]:
+    key = resultkey(result)
+    if key in before and before[key]:
+      ratios.append((key, result["persecond"] / before[key]))
+  regressions = [(key, ratio) for key, ratio in ratios if ratio < 1 - tolerance]
+  return ratios, regressions
+
+
+def parserange(text):
+  # "3-7" -> [3, 4, 5, 6, 7], "3,5" -> [3, 5]
+  values = []
+  for part in text.split(","):
+    start, _, end = part.partition("-")
+    values.extend(range(int(start), int(end or start) + 1))
+  return values
+
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(prog = "python -m noughts.benchmark", description = "Benchmark the board and search hot paths.")
+  parser.add_argument("--widths", type = parserange, default = parserange("3-7"), help = "board widths, e.g. 3-7 or 3,5")
+  parser.add_argument("--lines", type = parserange, default = parserange("2-8"), help = "winning line lengths")
+  parser.add_argument("--players", type = parserange, default = parserange("2-8"), help = "player counts")
+  parser.add_argument("--mintime", type = float, default = 0.05, help = "seconds spent on each measurement")
+  parser.add_argument("--seed", type = int, default = 0)
+  parser.add_argument("--output", help = "write the JSON report here instead of stdout")
+  parser.add_argument("--compare", help = "baseline JSON report to compare against")
+  parser.add_argument("--tolerance", type = float, default = 0.1, help = "slowdown counted as a regression")
+  args = parser.parse_args(argv)
+
+  report = runbenchmarks(args.widths, args.lines, args.players, args.mintime, args.seed)
+  if args.output:
+    with open(args.output, "w") as output:
+      json.dump(report, output, indent = 1)
+  else:
+    json.dump(report, sys.stdout, indent = 1)
+    print()
+
+  if args.compare:
+    with open(args.compare) as baselinefile:
+      ratios, regressions = compare(report, json.load(baselinefile), args.tolerance)
+    if ratios:
+      print("compared {} results, geometric mean ratio {:.3f}".format(len(ratios), float(np.exp(np.mean(np.log([ratio for key, ratio in ratios]))))), file = sys.stderr)
+    for key, ratio in regressions:
+      print("regression {:.1%}: {} {} width {} line {} players {}".format(1 - ratio, *key), file = sys.stderr)
+    if regressions:
+      sys.exit(1)
+
+
+if __name__  ==  "__main__":
+  main()
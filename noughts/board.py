@@ -0,0 +1,441 @@
+import random
+import string
+
+import numpy as np
+
+
+class WinLines():
+  # every winning segment on a board as flat cell indices and as BitBoard
+  # masks, with a reverse index from each cell to the segments through it
+  directions = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+  def __init__(self, boardsize, winlinelen):
+    self.boardsize = boardsize
+    self.winlinelen = winlinelen
+    segments = []
+    for rowstep, colstep in self.directions:
+      for row in range(0, boardsize):
+        for col in range(0, boardsize):
+          endrow = row + (winlinelen - 1) * rowstep
+          endcol = col + (winlinelen - 1) * colstep
+          if 0 <= endrow < boardsize and 0 <= endcol < boardsize:
+            segments.append([(row + i * rowstep) * boardsize + col + i * colstep for i in range(0, winlinelen)])
+    self.lines = np.array(segments, dtype = np.intp).reshape(-1, winlinelen)
+    self.masks = [sum(1 << (cell // boardsize * (boardsize + 1) + cell % boardsize) for cell in segment) for segment in segments]
+    celllines = [[] for i in range(0, boardsize ** 2)]
+    for lineindex, segment in enumerate(segments):
+      for cell in segment:
+        celllines[cell].append(lineindex)
+    self.celllines = [np.array(lineindices, dtype = np.intp) for lineindices in celllines]
+    # plain lists of the same for the per move loops of the rollouts
+    self.linecells = segments
+    self.celllinelists = celllines
+    self.cellmasks = [[self.masks[lineindex] for lineindex in lineindices] for lineindices in celllines]
+    # the same reverse index padded to a rectangle for batched lookups
+    maxlines = max([len(lineindices) for lineindices in celllines] + [0])
+    self.cellsegments = np.zeros((boardsize ** 2, maxlines, winlinelen), dtype = np.intp)
+    self.cellvalid = np.zeros((boardsize ** 2, maxlines), dtype = bool)
+    for cell, lineindices in enumerate(celllines):
+      self.cellsegments[cell, :len(lineindices)] = self.lines[lineindices]
+      self.cellvalid[cell, :len(lineindices)] = True
+
+
+winlinecache = {}
+
+def winlines(boardsize, winlinelen):
+  key = (boardsize, winlinelen)
+  if key not in winlinecache:
+    winlinecache[key] = WinLines(boardsize, winlinelen)
+  return winlinecache[key]
+
+
+zobristcache = {}
+
+def zobristkeys(boardsize, winlinelen, numplayers):
+  # fixed seed per config so every process hashes positions identically
+  key = (boardsize, winlinelen, numplayers)
+  if key not in zobristcache:
+    generator = random.Random("{} {} {}".format(*key))
+    base = generator.getrandbits(64)
+    cellkeys = [[generator.getrandbits(64) for cell in range(0, boardsize ** 2)] for playerindex in range(0, numplayers)]
+    zobristcache[key] = (base, cellkeys)
+  return zobristcache[key]
+
+
+symmetrycache = {}
+
+def symmetries(boardsize):
+  # the eight rotations and reflections of a square board as permutations
+  # of the flat cells, identity first: transform t moves cell c to cell
+  # symmetries(boardsize)[t, c]
+  if boardsize not in symmetrycache:
+    rows, cols = np.divmod(np.arange(boardsize ** 2), boardsize)
+    last = boardsize - 1
+    images = [(rows, cols), (cols, last - rows), (last - rows, last - cols), (last - cols, rows),
+              (rows, last - cols), (last - rows, cols), (cols, rows), (last - cols, last - rows)]
+    transforms = np.array([row * boardsize + col for row, col in images], dtype = np.intp)
+    symmetrycache[boardsize] = (transforms, transforms.tolist())
+  return symmetrycache[boardsize][0]
+
+def symmetrylists(boardsize):
+  # the same permutations as lists, for the per stone loops
+  symmetries(boardsize)
+  return symmetrycache[boardsize][1]
+
+
+def canonicalform(players, boardsize, numplayers):
+  # the least positionkey over the eight orientations of the flat player
+  # array, with the transform reaching it
+  transforms = symmetries(boardsize)
+  oriented = np.empty((len(transforms), boardsize ** 2), dtype = players.dtype)
+  oriented[np.arange(len(transforms))[:, None], transforms] = players
+  # positionkey orders like the cells read from the last one back
+  transform = min(range(0, len(transforms)), key = lambda t: oriented[t, ::-1].tolist())
+  key = 0
+  for player in oriented[transform, ::-1].tolist():
+    key = key * (numplayers + 1) + player
+  return key, transform
+
+
+# boards at least this wide only consider moves within candidateradius
+# cells of a stone
+largeboardsize = 9
+candidateradius = 2
+
+neighbourhoodcache = {}
+
+def neighbourhoods(boardsize, radius = candidateradius):
+  # the cells within radius rows and columns of each cell, as flat cell
+  # lists and as BitBoard masks
+  key = (boardsize, radius)
+  if key not in neighbourhoodcache:
+    cells = []
+    for cell in range(0, boardsize ** 2):
+      row, col = divmod(cell, boardsize)
+      cells.append([nearrow * boardsize + nearcol
+                    for nearrow in range(max(0, row - radius), min(boardsize, row + radius + 1))
+                    for nearcol in range(max(0, col - radius), min(boardsize, col + radius + 1))
+                    if (nearrow, nearcol) != (row, col)])
+    masks = [sum(1 << (near // boardsize * (boardsize + 1) + near % boardsize) for near in nearcells) for nearcells in cells]
+    neighbourhoodcache[key] = (cells, masks)
+  return neighbourhoodcache[key]
+
+
+def gamevariables(boardsize = 3, winlinelen = 3, numplayers = 2, humanplayers = 0, difficulty = 3):
+  # the settings dictionary GameBoard reads, without the window's sliders
+  return {
+    "Board Width": {"value": boardsize},
+    "Winning Line": {"value": winlinelen},
+    "Total Players": {"value": numplayers},
+    "Human Players": {"value": humanplayers},
+    "Difficulty": {"value": difficulty},
+  }
+
+
+class GameBoard():
+  def __init__(self, VariablesDict):
+    self.VariablesDict = VariablesDict
+    self.boardsize = VariablesDict["Board Width"]["value"]
+    self.numplayers = VariablesDict["Total Players"]["value"]
+    self.winlinelen = VariablesDict["Winning Line"]["value"]
+    self.humanplayers = VariablesDict["Human Players"]["value"]
+    self.winlines = winlines(self.boardsize, self.winlinelen)
+    self.zobristbase, self.zobristkeys = zobristkeys(self.boardsize, self.winlinelen, self.numplayers)
+    self.largeboard = self.boardsize >= largeboardsize
+
+    self.gametokens = [" ", "X", "O"]
+    if self.numplayers > 2:
+      for i in range(2, self.numplayers):
+        self.addtoken()
+
+    self.turnnum = 0
+    self.positions = np.full((self.boardsize, self.boardsize), " ", 'U1')
+    self.lastmove = None
+    self.moves = []
+    self.winner = 0
+    self.emptycells = self.boardsize ** 2
+    self.zobrist = self.zobristbase
+    self.humanturnnums = np.sort(np.random.choice(self.numplayers, self.humanplayers, replace = False))
+
+  def addtoken(self):
+    self.gametokens.append(random.choice([i for i in string.ascii_uppercase if i not in self.gametokens]))
+
+  def playernum(self, playerindex):
+    return playerindex + 1
+
+  def previousturnnum(self):
+    return (self.turnnum - 1) % self.numplayers
+
+  def playertoken(self, playerindex):
+    return self.gametokens[self.playernum(playerindex)]
+
+  def availablepositions(self):
+    return np.asarray(np.where((self.positions  ==  self.gametokens[0])  ==  True))
+
+  def candidatepositions(self):
+    # the moves worth searching: every empty cell, or on a large board the
+    # empty cells near a stone and the centre of an empty board
+    if not self.largeboard:
+      return self.availablepositions()
+    occupied = self.playerarray() != 0
+    if not occupied.any():
+      return np.array([[self.boardsize // 2], [self.boardsize // 2]], dtype = np.intp)
+    padded = np.pad(occupied, candidateradius)
+    near = np.zeros_like(occupied)
+    for rowshift in range(0, 2 * candidateradius + 1):
+      for colshift in range(0, 2 * candidateradius + 1):
+        near |= padded[rowshift:rowshift + self.boardsize, colshift:colshift + self.boardsize]
+    return np.asarray(np.where(near & ~occupied))
+
+  def playerarray(self):
+    players = np.zeros((self.boardsize, self.boardsize), dtype = np.int8)
+    for playerindex in range(0, self.numplayers):
+      players[self.positions  ==  self.playertoken(playerindex)] = self.playernum(playerindex)
+    return players
+
+  def positionkey(self):
+    # the position as a base numplayers + 1 number with one digit per cell,
+    # cell 0 lowest, so it does not depend on the order of the moves
+    key = 0
+    for player in self.playerarray().ravel()[::-1]:
+      key = key * (self.numplayers + 1) + int(player)
+    return key
+
+  def opening(self):
+    # fewer stones than the board is wide, where rotated and reflected
+    # transpositions of a position are common
+    return self.emptycells > self.boardsize * (self.boardsize - 1)
+
+  def cachekey(self):
+    # the Zobrist key position caches file the position under
+    return self.canonicalzobrist() if self.opening() else self.zobrist
+
+  def canonical(self):
+    # positionkey of the position turned to its canonical orientation, the
+    # same for all its rotations and reflections, and the transform index
+    return canonicalform(self.playerarray().ravel(), self.boardsize, self.numplayers)
+
+  def stones(self):
+    # (playerindex, cell) for every stone on the board
+    players = self.playerarray().ravel()
+    cells = np.flatnonzero(players)
+    return list(zip((players[cells] - 1).tolist(), cells.tolist()))
+
+  def canonicalzobrist(self):
+    # the least Zobrist hash over the eight orientations of the position
+    stones = self.stones()
+    least = None
+    for transform in symmetrylists(self.boardsize):
+      key = self.zobristbase
+      for playerindex, cell in stones:
+        key ^= self.zobristkeys[playerindex][transform[cell]]
+      if least is None or key < least:
+        least = key
+    return least
+
+  def fixedtransforms(self):
+    # the symmetries of the board that leave the position unchanged, the
+    # identity always among them
+    stones = self.stones()
+    owners = dict((cell, playerindex) for playerindex, cell in stones)
+    fixed = []
+    for transform in symmetrylists(self.boardsize):
+      for playerindex, cell in stones:
+        if owners.get(transform[cell]) != playerindex:
+          break
+      else:
+        fixed.append(transform)
+    return fixed
+
+  def distinctpositions(self):
+    # candidatepositions with a single move from each group of moves that
+    # a symmetry of the position maps onto one another
+    positions = self.candidatepositions()
+    fixed = self.fixedtransforms()
+    if len(fixed)  ==  1:
+      return positions
+    cells = positions[0] * self.boardsize + positions[1]
+    return positions[:, np.array(fixed)[:, cells].min(axis = 0)  ==  cells]
+
+  def adjustedposition(self, position):
+    return tuple(np.subtract(position, 1))
+
+  def makenextplay(self, position):
+    if self.positions[position]  ==  self.gametokens[0]:
+      self.positions[position] = self.gametokens[self.playernum(self.turnnum)]
+      self.recordplay(position)
+    else: return False
+
+  def recordplay(self, position):
+    self.lastmove = position
+    self.moves.append((int(position[0]), int(position[1])))
+    self.zobrist ^= self.zobristkeys[self.turnnum][position[0] * self.boardsize + position[1]]
+    self.emptycells -= 1
+    if not self.winner and self.linethrough(position):
+      self.winner = self.playernum(self.turnnum)
+    self.turnnum = (self.turnnum + 1) % self.numplayers
+
+  def linethrough(self, position):
+    lines = self.winlines.lines[self.winlines.celllines[position[0] * self.boardsize + position[1]]]
+    return bool(np.any(np.all(self.positions.ravel()[lines]  ==  self.positions[position], axis = 1)))
+
+  def copy(self):
+    return self.boardsize, self.numplayers, self.winlinelen, self.humanplayers
+
+  def clone(self):
+    board = self.__class__.__new__(self.__class__)
+    board.__dict__.update(self.__dict__)
+    board.positions = self.positions.copy()
+    board.moves = list(self.moves)
+    return board
+
+  def __getstate__(self):
+    # drop the slider callbacks and the shared line tables when pickling
+    # a board for a search worker
+    state = self.__dict__.copy()
+    state["VariablesDict"] = {key: {"value": entry["value"]} for key, entry in self.VariablesDict.items()}
+    del state["winlines"]
+    del state["zobristkeys"]
+    return state
+
+  def __setstate__(self, state):
+    self.__dict__.update(state)
+    self.winlines = winlines(self.boardsize, self.winlinelen)
+    self.zobristkeys = zobristkeys(self.boardsize, self.winlinelen, self.numplayers)[1]
+
+  def endgame(self):
+    if self.winner:
+      return self.winner
+    if self.emptycells  ==  0:
+      return 0
+    else:
+      return -1
+
+  def fullcheck(self):
+    flat = self.positions.ravel()
+    if np.any(np.all(flat[self.winlines.lines]  ==  self.playertoken(self.previousturnnum()), axis = 1)):
+      return self.playernum(self.previousturnnum())
+    if np.size(self.availablepositions())  ==  0:
+      return 0
+    else:
+      return -1
+
+
+class BitBoard(GameBoard):
+  # one integer bitmask per player, cells laid out row by row with a spare
+  # guard column so that shifting along a line never wraps onto the next row
+  def __init__(self, VariablesDict):
+    boardsize = VariablesDict["Board Width"]["value"]
+    self.stride = boardsize + 1
+    self.fullmask = 0
+    for row in range(0, boardsize):
+      self.fullmask |= ((1 << boardsize) - 1) << (row * self.stride)
+    self.lineshifts = (1, self.stride, self.stride + 1, self.stride - 1)
+    super().__init__(VariablesDict)
+
+  @property
+  def positions(self):
+    positions = np.full((self.boardsize, self.boardsize), self.gametokens[0], 'U1')
+    for playerindex, mask in enumerate(self.masks):
+      for row, col in zip(*self.maskpositions(mask)):
+        positions[row, col] = self.playertoken(playerindex)
+    return positions
+
+  @positions.setter
+  def positions(self, positions):
+    self.masks = [0] * self.numplayers
+    for playerindex in range(0, self.numplayers):
+      for row, col in zip(*np.where(positions == self.playertoken(playerindex))):
+        self.masks[playerindex] |= self.cellbit((row, col))
+    self.occupied = 0
+    for mask in self.masks:
+      self.occupied |= mask
+    self.zobrist = self.zobristbase
+    for playerindex, mask in enumerate(self.masks):
+      for row, col in zip(*self.maskpositions(mask)):
+        self.zobrist ^= self.zobristkeys[playerindex][row * self.boardsize + col]
+    self.candidates = 0
+    if self.largeboard:
+      nearmasks = neighbourhoods(self.boardsize)[1]
+      for playerindex, cell in self.stones():
+        self.candidates |= nearmasks[cell]
+      self.candidates &= ~self.occupied
+    self.lastmove = None
+    self.moves = []
+    self.emptycells = self.boardsize ** 2 - bin(self.occupied).count("1")
+    if self.haswon(self.masks[self.previousturnnum()]):
+      self.winner = self.playernum(self.previousturnnum())
+    else:
+      self.winner = 0
+
+  def cellbit(self, position):
+    return 1 << (int(position[0]) * self.stride + int(position[1]))
+
+  def maskpositions(self, mask):
+    rows = []
+    cols = []
+    while mask:
+      index = (mask & -mask).bit_length() - 1
+      rows.append(index // self.stride)
+      cols.append(index % self.stride)
+      mask &= mask - 1
+    return np.array([rows, cols], dtype = np.intp)
+
+  def availablepositions(self):
+    return self.maskpositions(self.fullmask & ~self.occupied)
+
+  def stones(self):
+    stones = []
+    for playerindex, mask in enumerate(self.masks):
+      while mask:
+        index = (mask & -mask).bit_length() - 1
+        stones.append((playerindex, index // self.stride * self.boardsize + index % self.stride))
+        mask &= mask - 1
+    return stones
+
+  def playerarray(self):
+    players = np.zeros((self.boardsize, self.boardsize), dtype = np.int8)
+    for playerindex, mask in enumerate(self.masks):
+      rows, cols = self.maskpositions(mask)
+      players[rows, cols] = self.playernum(playerindex)
+    return players
+
+  def makenextplay(self, position):
+    bit = self.cellbit(position)
+    if not self.occupied & bit:
+      self.masks[self.turnnum] |= bit
+      self.occupied |= bit
+      if self.largeboard:
+        self.candidates = (self.candidates | neighbourhoods(self.boardsize)[1][position[0] * self.boardsize + position[1]]) & ~self.occupied
+      self.recordplay(position)
+    else: return False
+
+  def candidatepositions(self):
+    if not self.largeboard:
+      return self.availablepositions()
+    if not self.occupied:
+      return np.array([[self.boardsize // 2], [self.boardsize // 2]], dtype = np.intp)
+    return self.maskpositions(self.candidates)
+
+  def clone(self):
+    board = self.__class__.__new__(self.__class__)
+    board.__dict__.update(self.__dict__)
+    board.masks = list(self.masks)
+    board.moves = list(self.moves)
+    return board
+
+  def linethrough(self, position):
+    mask = self.masks[self.turnnum]
+    for linemask in self.winlines.cellmasks[position[0] * self.boardsize + position[1]]:
+      if mask & linemask  ==  linemask:
+        return True
+    return False
+
+  def haswon(self, mask):
+    for shift in self.lineshifts:
+      line = mask
+      for i in range(1, self.winlinelen):
+        line &= line >> shift
+      if line:
+        return True
+    return False
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+
+from .board import symmetries
+
+
+bookdirectory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books")
+
+
+class OpeningBook():
+  # perfect play answers for one two player configuration: sorted canonical
+  # position keys with the move to play in that orientation and the game
+  # value for the player to move, 1 a win and 0 a draw. Lost positions are
+  # left out so the search, which plays on for the opponent's mistakes,
+  # handles them
+  def __init__(self, boardsize, winlinelen, keys, moves, values):
+    self.boardsize = boardsize
+    self.winlinelen = winlinelen
+    order = np.argsort(keys)
+    self.keys = np.asarray(keys, dtype = np.uint64)[order]
+    self.moves = np.asarray(moves, dtype = np.uint8)[order]
+    self.values = np.asarray(values, dtype = np.int8)[order]
+
+  def __len__(self):
+    return self.keys.size
+
+  @classmethod
+  def load(cls, path):
+    with np.load(path) as data:
+      return cls(int(data["boardsize"]), int(data["winlinelen"]), data["keys"], data["moves"], data["values"])
+
+  def save(self, path):
+    with open(path, "wb") as bookfile:
+      np.savez_compressed(bookfile, boardsize = self.boardsize, winlinelen = self.winlinelen,
+                          keys = self.keys, moves = self.moves, values = self.values)
+
+  def lookup(self, board):
+    # the book move for board as (row, col), or None when it is not covered
+    if (board.boardsize, board.winlinelen, board.numplayers) != (self.boardsize, self.winlinelen, 2) or board.endgame() >= 0:
+      return None
+    key, transform = board.canonical()
+    index = int(np.searchsorted(self.keys, key))
+    if index  ==  self.keys.size or int(self.keys[index]) != key:
+      return None
+    # the book move is stored in the canonical orientation
+    cell = int(np.flatnonzero(symmetries(self.boardsize)[transform]  ==  self.moves[index])[0])
+    return divmod(cell, self.boardsize)
+
+
+def bookpath(boardsize, winlinelen, directory = None):
+  return os.path.join(directory or bookdirectory, "{0}x{0}-{1}.npz".format(boardsize, winlinelen))
+
+
+bookcache = {}
+
+def openingbook(boardsize, winlinelen):
+  # the shipped book for a configuration, or None if there is none
+  key = (boardsize, winlinelen)
+  if key not in bookcache:
+    path = bookpath(boardsize, winlinelen)
+    bookcache[key] = OpeningBook.load(path) if os.path.exists(path) else None
+  return bookcache[key]
+
+
+def bookmove(board):
+  if board.numplayers != 2:
+    return None
+  book = openingbook(board.boardsize, board.winlinelen)
+  if book is None:
+    return None
+  return book.lookup(board)
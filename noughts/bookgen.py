@@ -0,0 +1,150 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from .board import canonicalform, symmetries, winlines
+from .book import OpeningBook, bookdirectory, bookpath
+
+
+# two player configurations small enough to solve outright
+bookconfigs = [(3, 2), (3, 3), (4, 2), (4, 3), (4, 4)]
+
+
+class Solver():
+  # exact two player solver over plain cell bitmasks without a guard column;
+  # solve takes the stones of the player to move and of the opponent, who
+  # made the last move, and returns 1, 0 or -1 for the player to move
+  def __init__(self, boardsize, winlinelen):
+    self.boardsize = boardsize
+    self.full = (1 << boardsize ** 2) - 1
+    lines = winlines(boardsize, winlinelen)
+    self.linemasks = [sum(1 << int(cell) for cell in line) for line in lines.lines]
+    self.cellmasks = [[self.linemasks[lineindex] for lineindex in lines.celllines[cell]] for cell in range(0, boardsize ** 2)]
+    # cells on the most lines first, which finds the refutations early
+    self.order = sorted(range(0, boardsize ** 2), key = lambda cell: -len(self.cellmasks[cell]))
+    self.memo = {}
+
+  def completes(self, mask, cell):
+    mask |= 1 << cell
+    for linemask in self.cellmasks[cell]:
+      if mask & linemask  ==  linemask:
+        return True
+    return False
+
+  def solve(self, mover, opponent):
+    key = mover | opponent << self.boardsize ** 2
+    value = self.memo.get(key)
+    if value is not None:
+      return value
+    occupied = mover | opponent
+    if occupied  ==  self.full:
+      return 0
+    # win at once if possible, otherwise every cell the opponent could
+    # complete a line on next has to be blocked
+    threats = []
+    for cell in self.order:
+      if occupied >> cell & 1:
+        continue
+      if self.completes(mover, cell):
+        self.memo[key] = 1
+        return 1
+      if self.completes(opponent, cell):
+        threats.append(cell)
+    if len(threats) > 1:
+      value = -1
+    else:
+      value = -1
+      for cell in threats or [cell for cell in self.order if not occupied >> cell & 1]:
+        value = max(value, -self.solve(opponent, mover | 1 << cell))
+        if value  ==  1:
+          break
+    self.memo[key] = value
+    return value
+
+  def bestmove(self, mover, opponent):
+    # first cell reaching the position's value, an immediate win if any
+    occupied = mover | opponent
+    bestcell, bestvalue = None, -2
+    for cell in self.order:
+      if occupied >> cell & 1:
+        continue
+      value = 1 if self.completes(mover, cell) else -self.solve(opponent, mover | 1 << cell)
+      if value > bestvalue:
+        bestcell, bestvalue = cell, value
+        if value  ==  1:
+          break
+    return bestcell, bestvalue
+
+
+def canonicalmasks(masks, boardsize):
+  # canonicalform of a two player position given as cell bitmasks
+  players = np.zeros(boardsize ** 2, dtype = np.int8)
+  for playerindex, mask in enumerate(masks):
+    for cell in range(0, boardsize ** 2):
+      if mask >> cell & 1:
+        players[cell] = playerindex + 1
+  return canonicalform(players, boardsize, 2)
+
+
+def generatebook(boardsize, winlinelen):
+  # every position either player can reach while following the book, with
+  # the opponent free to play anything, one orientation of each
+  solver = Solver(boardsize, winlinelen)
+  transforms = symmetries(boardsize)
+  book = {}
+  seen = set()
+  stack = [((0, 0), 0, bookplayer) for bookplayer in (0, 1)]
+  while stack:
+    masks, turnnum, bookplayer = stack.pop()
+    key, transform = canonicalmasks(masks, boardsize)
+    if (key, bookplayer) in seen:
+      continue
+    seen.add((key, bookplayer))
+    mover, opponent = masks[turnnum], masks[1 - turnnum]
+    if mover | opponent  ==  solver.full or any(opponent & linemask  ==  linemask for linemask in solver.linemasks):
+      continue
+    if turnnum  ==  bookplayer:
+      cell, value = solver.bestmove(mover, opponent)
+      if value < 0:
+        continue
+      book[key] = (int(transforms[transform, cell]), value)
+      cells = [cell]
+    else:
+      cells = [cell for cell in range(0, boardsize ** 2) if not (mover | opponent) >> cell & 1]
+    for cell in cells:
+      nextmasks = list(masks)
+      nextmasks[turnnum] |= 1 << cell
+      stack.append((tuple(nextmasks), 1 - turnnum, bookplayer))
+  keys = list(book)
+  return OpeningBook(boardsize, winlinelen, keys, [book[key][0] for key in keys], [book[key][1] for key in keys])
+
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(prog = "python -m noughts.bookgen", description = "Solve small two player configurations and write their opening books.")
+  parser.add_argument("--config", dest = "configs", action = "append", metavar = "WIDTHxWIDTH-LINE",
+                      help = "configuration to solve such as 4x4-4; repeatable, default all of {}".format(
+                        ", ".join("{0}x{0}-{1}".format(*config) for config in bookconfigs)))
+  parser.add_argument("--output", default = bookdirectory, help = "directory the books are written to")
+  args = parser.parse_args(argv)
+  configs = bookconfigs
+  if args.configs:
+    configs = []
+    for config in args.configs:
+      size, _, winlinelen = config.partition("-")
+      configs.append((int(size.partition("x")[0]), int(winlinelen)))
+
+  os.makedirs(args.output, exist_ok = True)
+  for boardsize, winlinelen in configs:
+    start = time.perf_counter()
+    book = generatebook(boardsize, winlinelen)
+    path = bookpath(boardsize, winlinelen, args.output)
+    book.save(path)
+    print("{0}x{0} line {1}: {2} positions, {3} bytes, {4:.1f}s".format(
+      boardsize, winlinelen, len(book), os.path.getsize(path), time.perf_counter() - start), file = sys.stderr)
+
+
+if __name__  ==  "__main__":
+  main()
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def windows(boardsize, winlinelen):
+  # for each line direction, the winlinelen slices whose elementwise
+  # comparison finds every line of that direction on an (N, n, n) stack
+  count = boardsize - winlinelen + 1
+  rows = [(slice(None), slice(None), slice(i, i + count)) for i in range(0, winlinelen)]
+  cols = [(slice(None), slice(i, i + count), slice(None)) for i in range(0, winlinelen)]
+  diagonals = [(slice(None), slice(i, i + count), slice(i, i + count)) for i in range(0, winlinelen)]
+  antidiagonals = [(slice(None), slice(i, i + count), slice(winlinelen - 1 - i, winlinelen - 1 - i + count)) for i in range(0, winlinelen)]
+  return [rows, cols, diagonals, antidiagonals]
+
+
+def evaluatechunk(chunk, winlinelen):
+  # winner of each board in chunk, 0 when nobody has a line. A board with
+  # lines for more than one player, which play can not reach, reports the
+  # highest numbered of them
+  count, boardsize = chunk.shape[0], chunk.shape[1]
+  winners = np.zeros(count, dtype = np.int8)
+  if winlinelen > boardsize:
+    return winners
+  for slices in windows(boardsize, winlinelen):
+    first = chunk[slices[0]]
+    same = first != 0
+    for window in slices[1:]:
+      same &= chunk[window]  ==  first
+    lines = np.where(same, first, 0).reshape(count, -1)
+    np.maximum(winners, lines.max(axis = 1).astype(np.int8), out = winners)
+  return winners
+
+
+def evaluatepositions(positions, winlinelen, chunksize = 65536):
+  # (winners, terminal) for a stack of boards laid out like playerarray(),
+  # 0 for an empty cell and playernum for a stone, given as an (N, n, n)
+  # array or the path of a .npy file, which is memory-mapped. The boards
+  # are read chunksize at a time so memory does not grow with N. Together
+  # they give endgame(): the winner, 0 for a full board, -1 otherwise
+  if isinstance(positions, str):
+    positions = np.load(positions, mmap_mode = "r")
+  if positions.ndim != 3 or positions.shape[1] != positions.shape[2]:
+    raise ValueError("positions must be an (N, n, n) array, not {}".format(positions.shape))
+  total = positions.shape[0]
+  winners = np.zeros(total, dtype = np.int8)
+  terminal = np.zeros(total, dtype = bool)
+  for start in range(0, total, chunksize):
+    chunk = np.asarray(positions[start:start + chunksize])
+    winners[start:start + chunksize] = evaluatechunk(chunk, winlinelen)
+    terminal[start:start + chunksize] = (winners[start:start + chunksize] > 0) | np.all(chunk.reshape(chunk.shape[0], -1) != 0, axis = 1)
+  return winners, terminal
+
+
+def batchendgame(positions, winlinelen, chunksize = 65536):
+  # endgame() for every board in positions
+  winners, terminal = evaluatepositions(positions, winlinelen, chunksize)
+  return np.where(terminal, winners, -1).astype(np.int8)
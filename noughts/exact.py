@@ -0,0 +1,156 @@
+from .board import winlines
+
+
+class OutOfBudget(Exception):
+  pass
+
+
+class ExactSearch():
+  # two player negamax with alpha-beta over plain cell bitmasks, deepened
+  # one ply at a time under a SearchBudget. A win scores one more than the
+  # number of cells left empty after it, so faster wins and slower losses
+  # score better, and positions past the depth limit score 0. The memo
+  # keeps a bound and the best move per position for later depths and
+  # later moves. An entry takes about 180 bytes, so the memo is emptied
+  # whenever it reaches memolimit entries, about 50MB
+  exact, lower, upper = 0, 1, 2
+  memolimit = 2 ** 18
+
+  def __init__(self, boardsize, winlinelen):
+    self.boardsize = boardsize
+    self.cells = boardsize ** 2
+    lines = winlines(boardsize, winlinelen)
+    linemasks = [sum(1 << int(cell) for cell in line) for line in lines.lines]
+    self.cellmasks = [[linemasks[lineindex] for lineindex in lines.celllines[cell]] for cell in range(0, self.cells)]
+    # cells on the most lines first
+    self.order = sorted(range(0, self.cells), key = lambda cell: -len(self.cellmasks[cell]))
+    self.memo = {}
+    self.nodes = 0
+
+  def completes(self, mask, cell):
+    mask |= 1 << cell
+    for linemask in self.cellmasks[cell]:
+      if mask & linemask  ==  linemask:
+        return True
+    return False
+
+  def search(self, board, budget):
+    # (move, score, solved) for the player to move, solved once the score
+    # no longer depends on the depth limit; the move comes from the deepest
+    # search that finished
+    masks = [0, 0]
+    for playerindex, cell in board.stones():
+      masks[playerindex] |= 1 << cell
+    mover, opponent = masks[board.turnnum], masks[1 - board.turnnum]
+    empties = board.emptycells
+    self.budget = budget
+    self.deadline = budget.deadline()
+    self.nodes = 0
+    result = None
+    for depth in range(1, empties + 1):
+      try:
+        move, score = self.root(mover, opponent, empties, depth)
+      except OutOfBudget:
+        break
+      result = (divmod(move, self.boardsize), score, score != 0 or depth  ==  empties)
+      if result[2]:
+        break
+    if result is None:
+      occupied = mover | opponent
+      move = next(cell for cell in self.order if not occupied >> cell & 1)
+      result = (divmod(move, self.boardsize), 0, False)
+    return result
+
+  def root(self, mover, opponent, empties, depth):
+    occupied = mover | opponent
+    cells = [cell for cell in self.order if not occupied >> cell & 1]
+    for cell in cells:
+      if self.completes(mover, cell):
+        return cell, empties
+    entry = self.memo.get(mover | opponent << self.cells)
+    if entry is not None and entry[3] is not None:
+      cells.remove(entry[3])
+      cells.insert(0, entry[3])
+    bestcell, best = cells[0], -self.cells - 1
+    for cell in cells:
+      score = -self.negamax(opponent, mover | 1 << cell, empties - 1, depth - 1, -self.cells - 1, -best)
+      if score > best:
+        bestcell, best = cell, score
+    self.memo[mover | opponent << self.cells] = (depth, best, self.exact, bestcell)
+    return bestcell, best
+
+  def negamax(self, mover, opponent, empties, depth, alpha, beta):
+    self.nodes += 1
+    if self.budget.exhausted(self.nodes, self.deadline):
+      raise OutOfBudget()
+    if empties  ==  0:
+      return 0
+    occupied = mover | opponent
+    threats = []
+    for cell in self.order:
+      if occupied >> cell & 1:
+        continue
+      if self.completes(mover, cell):
+        return empties
+      if self.completes(opponent, cell):
+        threats.append(cell)
+    # two open threats can not both be blocked
+    if len(threats) > 1:
+      return 1 - empties
+    if depth  ==  0:
+      return 0
+
+    # the bounds the position was searched with decide what the result is
+    start, end = alpha, beta
+    key = mover | opponent << self.cells
+    entry = self.memo.get(key)
+    memomove = None
+    if entry is not None:
+      entrydepth, score, flag, memomove = entry
+      if entrydepth >= depth:
+        if flag  ==  self.exact:
+          return score
+        if flag  ==  self.lower:
+          alpha = max(alpha, score)
+        else:
+          beta = min(beta, score)
+        if alpha >= beta:
+          return score
+
+    if threats:
+      cells = threats
+    else:
+      cells = [cell for cell in self.order if not occupied >> cell & 1]
+      if memomove is not None:
+        cells.remove(memomove)
+        cells.insert(0, memomove)
+    best, bestcell = -self.cells - 1, None
+    for cell in cells:
+      score = -self.negamax(opponent, mover | 1 << cell, empties - 1, depth - 1, -beta, -alpha)
+      if score > best:
+        best, bestcell = score, cell
+        if score > alpha:
+          alpha = score
+          if alpha >= beta:
+            break
+    if best <= start:
+      flag = self.upper
+    elif best >= end:
+      flag = self.lower
+    else:
+      flag = self.exact
+    if len(self.memo) >= self.memolimit:
+      self.memo.clear()
+    self.memo[key] = (depth, best, flag, bestcell)
+    return best
+
+
+exactcache = {}
+
+def exactsearch(boardsize, winlinelen):
+  # one searcher per configuration so its memo carries over between moves
+  key = (boardsize, winlinelen)
+  if key not in exactcache:
+    exactcache[key] = ExactSearch(boardsize, winlinelen)
+  return exactcache[key]
+
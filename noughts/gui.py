@@ -0,0 +1,722 @@
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pygame as pg
+
+from .board import BitBoard
+from .records import recordgame
+from .search import ParallelUCT, SearchBudget
+
+
+fontcache = {}
+fitcache = {}
+
+def cachedfont(size):
+  # one Font per size for the whole process, shared by every widget
+  size = max(1, int(size))
+  if size not in fontcache:
+    fontcache[size] = pg.font.Font(None, size)
+  return fontcache[size]
+
+def fittedfontsize(text, rectsize):
+  # largest font size whose rendering of text fits in 95% of rectsize,
+  # found by binary search and remembered per text and rect size
+  key = (text, tuple(int(i) for i in rectsize))
+  if key not in fitcache:
+    limit = [0.95 * i for i in key[1]]
+    fits = lambda size: all(np.less_equal(cachedfont(size).size(text), limit))
+    low, high = 1, max(2, key[1][1])
+    while fits(high):
+      low, high = high, 2 * high
+    while high - low > 1:
+      middle = (low + high) // 2
+      if fits(middle):
+        low = middle
+      else:
+        high = middle
+    fitcache[key] = low
+  return fitcache[key]
+
+
+class Button(object):
+  def __init__(self, rect, command = None, position = None, text = None, fontsize=None ,hover_text = None, clicked_text = None, disabled = False, **kwargs):
+    self.rect = pg.Rect(rect)
+    self.command = command
+    self.disabled = disabled
+    self.clicked = False
+    self.hovered = False
+    self.parse_text(text,hover_text,clicked_text)
+    self.process_kwargs(kwargs)
+    self.position = position
+    self.fontsize = fontsize
+    if self.text != " ":
+      self.resizefont(self.fontsize)
+    self.render_text()
+
+  def resizefont(self, size=None):
+    if size is None:
+      size = fittedfontsize(self.text, self.rect.size)
+    self.font = cachedfont(size)
+    self.fontsize = size
+
+  def parse_text(self,text,hover_text,clicked_text):
+    if text:
+      self.text = text
+    else:
+      self.text = ""
+    if hover_text:
+      self.hover_text = hover_text
+    else:
+      self.hover_text = self.text
+    if clicked_text:
+      self.clicked_text = clicked_text
+    else:
+      self.clicked_text = self.text
+
+  def process_kwargs(self, kwargs):
+    settings = {
+      "color": pg.Color('white'),
+      "clicked_text_render":None,
+      "hover_text_render":None,
+      "font": cachedfont(72),
+      "call_on_release": True,
+      "hover_color": None,
+      "clicked_color": None,
+      "font_color": pg.Color('black'),
+      "hover_font_color": None,
+      "clicked_font_color": None,
+      "click_sound": None,
+      "hover_sound": None,
+      'border_color': pg.Color('black'),
+      'border_hover_color': pg.Color('yellow'),
+      'disabled': False,
+      'disabled_color': pg.Color('grey'),
+      'radius': 3,
+    }
+    for kwarg in kwargs:
+      if kwarg in settings:
+        settings[kwarg] = kwargs[kwarg]
+      else:
+        raise AttributeError("{} has no keyword: {}".format(self.__class__.__name__, kwarg))
+    self.__dict__.update(settings)
+
+  def render_text(self):
+    if self.hover_font_color:
+      color = self.hover_font_color
+      self.hover_text_render = self.font.render(self.hover_text, True, color)
+    if self.clicked_font_color:
+      color = self.clicked_font_color
+      self.clicked_text_render = self.font.render(self.clicked_text, True, color)
+    self.text_render = self.font.render(self.text, True, self.font_color)
+    self.surfaces = {}
+
+  def get_event(self, event):
+    if event.type  ==  pg.MOUSEBUTTONDOWN and event.button  ==  1:
+      self.on_click(event)
+    elif event.type  ==  pg.MOUSEBUTTONUP and event.button  ==  1:
+      self.on_release(event)
+
+  def on_click(self, event):
+    if self.rect.collidepoint(event.pos):
+      self.clicked = True
+
+  def on_release(self, event):
+    if self.clicked and self.call_on_release:
+      # if user is still within button rect upon mouse release
+      if self.rect.collidepoint(pg.mouse.get_pos()):
+        self.command()
+    self.clicked = False
+
+  def check_hover(self):
+    if self.rect.collidepoint(pg.mouse.get_pos()):
+      if not self.hovered:
+        self.hovered = True
+        if self.hover_sound:
+          self.hover_sound.play()
+    else:
+      self.hovered = False
+
+  def state(self):
+    if self.disabled:
+      return "disabled"
+    if self.clicked:
+      return "clicked"
+    if self.hovered:
+      return "hover"
+    return "normal"
+
+  def style(self, state):
+    color = self.color
+    text = self.text_render
+    border = self.border_color
+    if state  ==  "clicked":
+      color = self.clicked_color
+      if self.clicked_font_color:
+        text = self.clicked_text_render
+    elif state  ==  "hover":
+      if self.hover_color:
+        color = self.hover_color
+        if self.hover_font_color:
+          text = self.hover_text_render
+      border = self.border_hover_color
+    elif state  ==  "disabled":
+      color = self.disabled_color
+    return color, text, border
+
+  def draw(self, surface):
+    self.check_hover()
+    image, text = self.cached_surface(self.state(), self.rect.size, True)
+    surface.blit(image, self.rect)
+    if text:
+      text_rect = text.get_rect(center = self.rect.center)
+      surface.blit(text, text_rect)
+
+  def cached_surface(self, state, size, withtext):
+    # the widget drawn in one visual state, built once and reused until the
+    # rect size, the text or the state changes; text that overflows the
+    # rect is handed back to be drawn on top unclipped
+    key = (state, size, withtext)
+    if key not in self.surfaces:
+      if len(self.surfaces) > 16:
+        self.surfaces.clear()
+      color, text, border = self.style(state)
+      image = self.round_rect(size, border, self.radius or 0, 1, color)
+      if withtext and text:
+        text_rect = text.get_rect(center = image.get_rect().center)
+        if image.get_rect().contains(text_rect):
+          image.blit(text, text_rect)
+          text = None
+      self.surfaces[key] = image, text if withtext else None
+    return self.surfaces[key]
+
+  def round_rect(self, size, color, rad = 20, border = 0, inside = (0, 0, 0, 0)):
+    zeroed_rect = pg.Rect((0, 0), size)
+    image = pg.Surface(size).convert_alpha()
+    image.fill((0, 0, 0, 0))
+    self._render_region(image, zeroed_rect, color, rad)
+    if border:
+      zeroed_rect.inflate_ip(-2 * border, -2 * border)
+      self._render_region(image, zeroed_rect, inside, rad)
+    return image
+
+  def _render_region(self, image, rect, color, rad):
+    corners = rect.inflate(-2 * rad, -2 * rad)
+    for attribute in ("topleft", "topright", "bottomleft", "bottomright"):
+      pg.draw.circle(image, color, getattr(corners, attribute), rad)
+    image.fill(color, rect.inflate(-2 * rad, 0))
+    image.fill(color, rect.inflate(0, -2 * rad))
+
+
+class Slider(object):
+  def __init__(self, rect, sliderrectsize, startingvalue, command, slideroffset = None, text = None, hover_text = None, clicked_text = None, xlimit = None, ylimit = None, valuerange = (0,0), *args, **kwargs):
+    self.rect = pg.Rect(rect)
+    self.command = command
+    self.startingvalue = startingvalue
+    self.valuerange = valuerange
+    self.notches = valuerange[1] - valuerange[0]
+    self.clicked = False
+    self.hovered = False
+    self.parse_text(text,hover_text,clicked_text)
+    self.set_limits(xlimit,ylimit,slideroffset)
+    self.createsliderlines()
+    self.sliderrectsize = sliderrectsize
+    self.set_notches(self.sliderrectsize)
+    self.sliderrect = pg.Rect(tuple(np.subtract(self.notchpoints[self.startingvalue],tuple([i/2 for i in self.sliderrectsize])))+sliderrectsize)
+    self.process_kwargs(kwargs)
+    self.resizefont()
+    self.render_text()
+
+  def createsliderlines(self):
+    self.endpoints = list(tuple(zip(self.xlimit, self.ylimit)))
+    self.gradient = np.subtract(self.endpoints[1], self.endpoints[0]) / np.linalg.norm(
+        np.subtract(self.endpoints[1], self.endpoints[0]))
+    self.perpgradient = (self.gradient[1], -self.gradient[0])
+
+  def set_limits(self,xlimit,ylimit,slideroffset):
+    if xlimit is not None:
+      self.xlimit = xlimit
+    else:
+      self.xlimit = (self.rect.centerx+slideroffset[0],self.rect.centerx+slideroffset[0])
+    if ylimit is not None:
+      self.ylimit = ylimit
+    else:
+      self.ylimit = (self.rect.centery+slideroffset[1],self.rect.centery+slideroffset[1])
+
+  def set_notches(self, sliderrectsize):
+    increment = np.subtract(self.endpoints[1],self.endpoints[0])/self.notches
+    linewidth = tuple([i * int(sliderrectsize[1] / 2) for i in self.perpgradient])
+    self.notchlines = {}
+    self.notchpoints = {}
+    notchnumber = 0
+    for notch in np.arange(self.valuerange[0],self.valuerange[1]+1):
+      self.notchpoints[notch] = tuple(self.endpoints[0]+increment*notchnumber)
+      self.notchlines[notch] = [(self.endpoints[0]+increment*notchnumber+linewidth),(self.endpoints[0]+increment*notchnumber-linewidth)]
+      notchnumber += 1
+
+  def findnearestnotch(self, position):
+    notchdistances = {np.linalg.norm(np.subtract(value[1],position)):value[0] for value in self.notchpoints.items()}
+    self.nearestnotch = notchdistances[min(notchdistances.keys())]
+    return self.nearestnotch
+
+  def movetonotch(self, rect, notchvalue):
+    rect = rect.move(np.subtract(self.notchpoints[notchvalue],rect.center))
+    return rect
+
+  def resizefont(self, size=None):
+    if size is None:
+      size = fittedfontsize(self.text, self.rect.size)
+    self.font = cachedfont(size)
+    self.fontsize = size
+
+  def parse_text(self,text,hover_text,clicked_text):
+    if text:
+      self.text = text
+    else:
+      self.text = ""
+    if hover_text:
+      self.hover_text = hover_text
+    else:
+      self.hover_text = self.text
+    if clicked_text:
+      self.clicked_text = clicked_text
+    else:
+      self.clicked_text = self.text
+
+  def process_kwargs(self, kwargs):
+    settings = {
+      "color": pg.Color('white'),
+      "clicked_text_render":None,
+      "hover_text_render":None,
+      "font": cachedfont(50),
+      "call_on_release": True,
+      "hover_color": None,
+      "clicked_color": None,
+      "font_color": pg.Color('black'),
+      "hover_font_color": None,
+      "clicked_font_color": None,
+      "click_sound": None,
+      "hover_sound": None,
+      'border_color': pg.Color('black'),
+      'border_hover_color': pg.Color('yellow'),
+      'disabled': False,
+      'disabled_color': pg.Color('grey'),
+      'radius': 3,
+    }
+    for kwarg in kwargs:
+      if kwarg in settings:
+        settings[kwarg] = kwargs[kwarg]
+      else:
+        raise AttributeError("{} has no keyword: {}".format(self.__class__.__name__, kwarg))
+    self.__dict__.update(settings)
+
+  def render_text(self):
+    if self.hover_font_color:
+      color = self.hover_font_color
+      self.hover_text_render = self.font.render(self.hover_text, True, color)
+    if self.clicked_font_color:
+      color = self.clicked_font_color
+      self.clicked_text_render = self.font.render(self.clicked_text, True, color)
+    self.text_render = self.font.render(self.text, True, self.font_color)
+    self.surfaces = {}
+
+  def get_event(self, event):
+    if event.type  ==  pg.MOUSEBUTTONDOWN and event.button  ==  1:
+      self.on_click(event)
+    elif event.type  ==  pg.MOUSEBUTTONUP and event.button  ==  1:
+      self.on_release(event)
+
+  def on_click(self, event):
+    if self.sliderrect.collidepoint(event.pos):
+      self.clicked = True
+
+  def on_release(self, event):
+    if self.clicked and self.call_on_release:
+      # if user is still within button rect upon mouse release
+      if pg.mouse.get_rel():
+        self.command(self.nearestnotch)
+    self.clicked = False
+
+  def check_hover(self):
+    if self.sliderrect.collidepoint(pg.mouse.get_pos()):
+      if not self.hovered:
+        self.hovered = True
+        if self.hover_sound:
+          self.hover_sound.play()
+    else:
+      self.hovered = False
+
+  def state(self):
+    if self.disabled:
+      return "disabled"
+    if self.clicked:
+      return "clicked"
+    if self.hovered:
+      return "hover"
+    return "normal"
+
+  def style(self, state):
+    color = self.color
+    text = self.text_render
+    border = self.border_color
+    if state  ==  "clicked":
+      color = self.clicked_color
+      if self.clicked_font_color:
+        text = self.clicked_text_render
+    elif state  ==  "hover":
+      if self.hover_color:
+        color = self.hover_color
+        if self.hover_font_color:
+          text = self.hover_text_render
+      border = self.border_hover_color
+    elif state  ==  "disabled":
+      color = self.disabled_color
+    return color, text, border
+
+  def draw(self, surface):
+    self.check_hover()
+    state = self.state()
+    color = self.style(state)[0]
+    pg.draw.line(surface, color, self.endpoints[0],self.endpoints[1])
+    for notch in self.notchlines:
+      pg.draw.line(surface, color, self.notchlines[notch][0], self.notchlines[notch][1])
+    image, text = self.cached_surface(state, self.rect.size, True)
+    surface.blit(image, self.rect)
+    surface.blit(self.cached_surface(state, self.sliderrect.size, False)[0], self.sliderrect)
+    if text:
+      text_rect = text.get_rect(center = self.rect.center)
+      surface.blit(text, text_rect)
+
+  def cached_surface(self, state, size, withtext):
+    # the widget drawn in one visual state, built once and reused until the
+    # rect size, the text or the state changes; text that overflows the
+    # rect is handed back to be drawn on top unclipped
+    key = (state, size, withtext)
+    if key not in self.surfaces:
+      if len(self.surfaces) > 16:
+        self.surfaces.clear()
+      color, text, border = self.style(state)
+      image = self.round_rect(size, border, self.radius or 0, 1, color)
+      if withtext and text:
+        text_rect = text.get_rect(center = image.get_rect().center)
+        if image.get_rect().contains(text_rect):
+          image.blit(text, text_rect)
+          text = None
+      self.surfaces[key] = image, text if withtext else None
+    return self.surfaces[key]
+
+  def round_rect(self, size, color, rad = 20, border = 0, inside = (0, 0, 0, 0)):
+    zeroed_rect = pg.Rect((0, 0), size)
+    image = pg.Surface(size).convert_alpha()
+    image.fill((0, 0, 0, 0))
+    self._render_region(image, zeroed_rect, color, rad)
+    if border:
+      zeroed_rect.inflate_ip(-2 * border, -2 * border)
+      self._render_region(image, zeroed_rect, inside, rad)
+    return image
+
+  def _render_region(self, image, rect, color, rad):
+    corners = rect.inflate(-2 * rad, -2 * rad)
+    for attribute in ("topleft", "topright", "bottomleft", "bottomright"):
+      pg.draw.circle(image, color, getattr(corners, attribute), rad)
+    image.fill(color, rect.inflate(-2 * rad, 0))
+    image.fill(color, rect.inflate(0, -2 * rad))
+
+
+def HumanPlayFunc(position):
+  global board
+  if board.turnnum in board.humanturnnums and board.endgame() < 0:
+    board.makenextplay(position)
+
+def ResetBoardFunc():
+  global GameResetBoolean
+  GameResetBoolean = True
+
+def ChangeBoardSizeFunc(newsize):
+  global GameVariablesDict
+  GameVariablesDict["Board Width"]["value"] = newsize
+
+def ChangeWinningLineFunc(newlength):
+  global GameVariablesDict
+  GameVariablesDict["Winning Line"]["value"] = newlength
+
+def ChangePlayerCountFunc(newplayers):
+  global GameVariablesDict
+  GameVariablesDict["Total Players"]["value"] = newplayers
+
+def ChangeHumanPlayerCountFunc(newhumanplayers):
+  global GameVariablesDict
+  GameVariablesDict["Human Players"]["value"] = newhumanplayers
+
+def ChangeDifficultyFunc(newdifficulty):
+  global GameVariablesDict
+  GameVariablesDict["Difficulty"]["value"] = newdifficulty
+
+def CreateButtonsFunc(boardsize):
+  global btns, screensize, board
+  if btns != []:
+    del btns
+    btns = []
+  btn_height = min(screensize[0] * 3 / 4, screensize[1]) / boardsize
+  btn_width = btn_height
+  for row in range(0, boardsize):
+    for col in range(0, boardsize):
+        top = btn_height * row
+        left = btn_width * col
+        if row+col == 0:
+            b = Button(rect = (left, top, btn_width, btn_height), text = "X", command = lambda l = (row,col): HumanPlayFunc(l), position = (row,col), **buttonsettings)
+            btns.append(b)
+            fontsize = b.fontsize
+        else:
+            b = Button(rect=(left, top, btn_width, btn_height), text="X", fontsize = fontsize,
+                     command=lambda l=(row, col): HumanPlayFunc(l), position=(row, col), **buttonsettings)
+            btns.append(b)
+  b = Button(rect = (screensize[0] * 61/80-80, screensize[1]-130, 300, 100), command = ResetBoardFunc, text = "Restart",
+        **buttonsettings)
+  btns.append(b)
+
+def CreateSlidersFunc(availablerect, labelsize, sliderrectsize, GameVariablesDict):
+  global slds
+  if slds != {}:
+    slds = {}
+
+  labelposition = np.subtract((int(availablerect[0]+availablerect[2]*1/2),int(availablerect[1]+availablerect[3] * 1 / 20)),[int(0.5*i) for i in labelsize])
+  xlimit = np.add((availablerect[2]*1/10,availablerect[2]*9/10),availablerect[0])
+  ylimit = (labelposition[1] + labelsize[1] + sliderrectsize[1]*1/2 ,)*2
+  slidernumber = 0
+  totalsliders = len(GameVariablesDict.keys()) + 1
+  increment = int(availablerect[3]/totalsliders)
+
+  for key in GameVariablesDict.keys():
+    s = Slider(rect = (labelposition[0],labelposition[1]+slidernumber*increment+10)+labelsize, sliderrectsize = sliderrectsize, startingvalue = GameVariablesDict[key]["value"],
+          command = GameVariablesDict[key]["function"], text = key, xlimit = xlimit, ylimit = np.add(ylimit,slidernumber*increment+10),
+          valuerange = GameVariablesDict[key]["range"], **slidersettings)
+    slds[key] = s
+    slidernumber += 1
+
+def CreateDisplayWindowsFunc(sliders):
+  global wndws, screensize
+  wndws = {}
+  firstsliderbool=True
+  for key in sliders.keys():
+    rect = sliders[key].rect
+    rectposition = rect.topleft
+    windowrect = (rectposition[0]+rect.size[0]+30, rectposition[1], 40, rect.size[1])
+    if firstsliderbool:
+        window = Button(windowrect, text = str(sliders[key].startingvalue), disabled = True, **buttonsettings)
+        wndws[key] = window
+        fontsize = window.fontsize
+    else:
+        window = Button(windowrect, text=str(sliders[key].startingvalue), fontsize=fontsize, disabled=True, **buttonsettings)
+        wndws[key] = window
+
+  currentturnrect = (screensize[1],0,screensize[0]-screensize[1],150)
+  # fit the font to the longest text the window shows
+  wndws["Current Turn"] = Button(currentturnrect, text = "Player 1 is thinking...", disabled = True, **buttonsettings)
+
+def CreateWinScreenFunc(screensize, board):
+  global btns, slds, wndws, EndGameScreenBool
+  btns = []
+  slds = {}
+  wndws = {}
+
+  if board.endgame()  ==  0:
+    victorytext = "Stalemate"
+  else:
+    if board.previousturnnum() in board.humanturnnums:
+      victorytext = "Human player "+ str(board.playernum(list(board.humanturnnums).index(board.previousturnnum())))+" wins!"
+    else:
+      victorytext = "Player "+ str(board.playernum(board.previousturnnum()))+ " wins!"
+
+  b = Button(rect = (0, screensize[1]*3/8, screensize[0], screensize[1]*1/4), disabled = True, text = victorytext, **buttonsettings)
+  btns.append(b)
+  b = Button(rect = (screensize[0] * 1/2-150, screensize[1]*5/8, 300, 100), command = ResetBoardFunc, text = "Restart",
+        **buttonsettings)
+  btns.append(b)
+  EndGameScreenBool = True
+
+btns = []
+slds = {}
+wndws = {}
+
+
+def main(argv = None):
+  global btns, slds, wndws, board, screensize, GameVariablesDict, GameResetBoolean, EndGameScreenBool, buttonsettings, slidersettings
+  parser = argparse.ArgumentParser(prog = "python -m noughts", description = "Play noughts and crosses against the UCT search.")
+  parser.add_argument("--record", default = os.path.join(os.path.expanduser("~"), ".noughts", "games.bin"),
+                      help = "game log that finished games are appended to, default ~/.noughts/games.bin")
+  parser.add_argument("--stats", action = "store_true", help = "log where each AI move's search spent its time")
+  args = parser.parse_args(argv)
+  if args.stats:
+    logging.basicConfig(level = logging.INFO, format = "%(asctime)s %(message)s")
+  recordpath = args.record
+  searchpool = ParallelUCT(tablesize = 2 ** 18, instrument = args.stats, rolloutpolicy = "threat")
+  pg.init()
+
+  slidersettings = {
+    "clicked_font_color": (0, 0, 0),
+    "clicked_color": (255, 255, 255),
+    "hover_font_color": (0, 0, 0),
+    "hover_color": (255, 255, 235),
+    'font': cachedfont(30),
+    'font_color': (0, 0, 0),
+    'border_color': (0, 0, 0),
+  }
+  buttonsettings = {
+    "clicked_font_color": (0, 0, 0),
+    "clicked_color": (255, 255, 255),
+    "hover_font_color": (0, 0, 0),
+    "hover_color": (255, 255, 235),
+    'font': cachedfont(250),
+    'font_color': (0, 0, 0),
+    'border_color': (0, 0, 0),
+  }
+  GameVariablesDict = {
+    "Board Width":{"function": ChangeBoardSizeFunc, "range":(3,19), "value":3},
+    "Winning Line": {"function": ChangeWinningLineFunc, "range": (2,8), "value":3},
+    "Total Players":{"function": ChangePlayerCountFunc, "range":(2,8), "value":2},
+    "Human Players": {"function": ChangeHumanPlayerCountFunc, "range": (1, 8), "value":1},
+    "Difficulty": {"function": ChangeDifficultyFunc, "range": (1, 10), "value":3},
+  }
+
+  screensize = (1920, 1080)
+  screen = pg.display.set_mode(screensize, pg.RESIZABLE)
+  pg.display.set_caption("Noughts and Crosses")
+  screen_rect = screen.get_rect()
+
+  CreateSlidersFunc((screensize[1],screensize[1]*1/8,screensize[0]-screensize[1],screensize[1]*8/10), labelsize = (150,50), sliderrectsize = (10,50), GameVariablesDict = GameVariablesDict)
+  CreateButtonsFunc(GameVariablesDict["Board Width"]["value"])
+  CreateDisplayWindowsFunc(slds)
+
+  opponentbudget = SearchBudget.fordifficulty(GameVariablesDict["Difficulty"]["value"], GameVariablesDict["Board Width"]["value"])
+
+  board = BitBoard(GameVariablesDict)
+
+  #for i in range(0, GameVariablesDict["Human Players"]["value"]):
+  #  print("\nHuman player ", i + 1, "you are player", board.humanturnnums[i] + 1, "your piece is",
+  #     board.gametokens[board.playernum(board.humanturnnums[i])])
+
+  gameclock = pg.time.Clock()
+  GameOver = board.endgame()
+  GameResetBoolean = False
+  EndGameScreenBool = False
+  turn = 0
+  aimove = None
+
+  while True:
+    screen.fill(pg.Color("Black"))
+    mouse = pg.mouse.get_pos()
+    for event in pg.event.get():
+      if event.type  ==  pg.QUIT:
+        searchpool.shutdown()
+        pg.quit()
+        sys.exit(0)
+      if event.type  ==  pg.VIDEORESIZE and screensize != event.size:
+        factor = np.subtract(np.divide(event.size,screensize),1)
+        screensize = event.size
+        for btn in btns:
+          btn.rect = btn.rect.inflate(btn.rect.size*factor)
+          btn.rect = btn.rect.move(btn.rect.center*factor)
+          if btn.text != " ":
+            btn.resizefont(size = int(btn.fontsize*(1 + np.min(factor))))
+          btn.render_text()
+        for sld in slds.values():
+          sld.rect = sld.rect.inflate(sld.rect.size*factor)
+          sld.sliderrect = sld.sliderrect.inflate(sld.sliderrect.size*factor)
+          sld.rect = sld.rect.move(sld.rect.center*factor)
+          sld.sliderrect = sld.sliderrect.move(sld.sliderrect.center*factor)
+          sld.xlimit = sld.xlimit*(1 + factor[0])
+          sld.ylimit = sld.ylimit*(1 + factor[1])
+          sld.createsliderlines()
+          sld.set_notches(sld.sliderrect.size)
+          sld.resizefont(size = int(sld.fontsize*(1 + np.min(factor))))
+          sld.render_text()
+        for wndw in wndws.values():
+          wndw.rect = wndw.rect.inflate(wndw.rect.size * factor)
+          wndw.rect = wndw.rect.move(wndw.rect.center * factor)
+          wndw.resizefont(size = int(wndw.fontsize*(1 + np.min(factor))))
+          wndw.render_text()
+        screencopy = screen.copy()
+        screen = pg.display.set_mode(screensize, pg.RESIZABLE)
+        screen.blit(screencopy, (0,0))
+      for btn in btns:
+        btn.get_event(event)
+      for key in slds.keys():
+        slds[key].get_event(event)
+        if slds[key].clicked:
+          notchvalue = slds[key].findnearestnotch(mouse)
+          slds[key].sliderrect = slds[key].movetonotch(slds[key].sliderrect,notchvalue)
+          wndws[key].text = str(notchvalue)
+          wndws[key].render_text()
+
+    # render every frame so the window stays responsive while the AI thinks
+    turn = board.turnnum
+    if wndws != {}:
+      if aimove is not None:
+        currentturntext = "Player " + str(board.playernum(turn)) + " is thinking" + "." * (int(time.time() * 2) % 4)
+      else:
+        currentturntext = "Player " + str(board.playernum(turn)) + "'s turn"
+      if wndws["Current Turn"].text != currentturntext:
+        wndws["Current Turn"].text = currentturntext
+        wndws["Current Turn"].hover_text = wndws["Current Turn"].clicked_text = wndws["Current Turn"].text
+        wndws["Current Turn"].render_text()
+    positions = board.positions
+    for btn in btns:
+      if btn.position:
+        text = positions[btn.position]
+        hover_text = board.playertoken(turn) if text  ==  " " else text
+        if (btn.text, btn.hover_text) != (text, hover_text):
+          btn.text = text
+          btn.hover_text = btn.clicked_text = hover_text
+          btn.render_text()
+      btn.draw(screen)
+    for sld in slds.values():
+      sld.draw(screen)
+    for wndw in wndws.values():
+      wndw.draw(screen)
+    pg.display.update()
+    gameclock.tick(40)
+    GameOver = board.endgame()
+
+    if GameOver != -1:
+      if not EndGameScreenBool:
+        try:
+          os.makedirs(os.path.dirname(os.path.abspath(recordpath)), exist_ok = True)
+          recordgame(recordpath, board)
+        except OSError as error:
+          logging.warning("could not record the game to %s: %s", recordpath, error)
+        CreateWinScreenFunc(screensize, board)
+      else:
+        pass
+    else:
+      # the AI searches in the background and its move is played once ready
+      if board.turnnum not in board.humanturnnums:
+        if aimove is None:
+          aimove = searchpool.submit(board, opponentbudget)
+        elif aimove.done():
+          # with --stats the move comes back with its SearchStats, which the
+          # search has already logged
+          move = aimove.result()
+          board.makenextplay(move[0] if searchpool.instrument else move)
+          aimove = None
+
+    if GameResetBoolean:
+      if aimove is not None:
+        searchpool.stop()
+      screen.fill(pg.Color("Black"))
+      factor = board.boardsize / GameVariablesDict["Board Width"]["value"] - 1
+      board = BitBoard(GameVariablesDict)
+      CreateButtonsFunc(GameVariablesDict["Board Width"]["value"])
+      CreateSlidersFunc(
+        (screensize[1], screensize[1] * 1 / 8, screensize[0] - screensize[1], screensize[1] * 9 / 10),
+        labelsize = (150, 50), sliderrectsize = (10, 50), GameVariablesDict = GameVariablesDict)
+      CreateDisplayWindowsFunc(slds)
+      GameResetBoolean = False
+      EndGameScreenBool = False
+      turn = -1
+      GameOver = -1
+      aimove = None
+      opponentbudget = SearchBudget.fordifficulty(GameVariablesDict["Difficulty"]["value"], GameVariablesDict["Board Width"]["value"])
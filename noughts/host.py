@@ -0,0 +1,340 @@
+import argparse
+import asyncio
+import concurrent.futures
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import time
+
+import numpy as np
+
+from .board import BitBoard, gamevariables
+from .search import rolloutpolicies
+from .server import percentiles, startserviceworker, suggestmoves
+
+
+logger = logging.getLogger(__name__)
+
+# local players connect over TCP or a Unix socket and speak one JSON
+# object per line. {"command": "play", "boardsize": 3, "winlinelen": 3,
+# "numplayers": 2, "humans": 1, "milliseconds": 200} starts a match with
+# that many seats for the connection and the AI in the rest. The host
+# sends the position after every move, {"match": 1, "positions": ...,
+# "turnnum": 0, "yourturn": true}, then the winner, and takes
+# {"match": 1, "move": [row, col]} on the connection's turns.
+# {"command": "report"} returns the host report
+
+
+class Match():
+  def __init__(self, matchid, boardsize, winlinelen, numplayers, milliseconds, connection = None, humans = 0):
+    self.matchid = matchid
+    self.config = "{0}x{0}-{1}".format(boardsize, winlinelen) + ("" if numplayers  ==  2 else "/{}".format(numplayers))
+    self.board = BitBoard(gamevariables(boardsize, winlinelen, numplayers, humans))
+    self.milliseconds = milliseconds
+    self.connection = connection
+    self.moves = asyncio.Queue()
+    self.latencies = []
+    self.misses = 0
+    self.started = time.perf_counter()
+    self.finished = None
+    self.abandoned = False
+
+  def state(self):
+    board = self.board
+    return {"match": self.matchid, "positions": board.playerarray().tolist(), "turnnum": board.turnnum,
+            "lastmove": board.lastmove and [int(i) for i in board.lastmove], "yourturn": board.turnnum in board.humanturnnums}
+
+  def summary(self):
+    latencies = np.array(self.latencies)
+    return {
+      "match": self.matchid,
+      "config": self.config,
+      "moves": len(self.board.moves),
+      "aimoves": latencies.size,
+      "winner": -2 if self.abandoned else self.board.endgame(),
+      "seconds": round((self.finished or time.perf_counter()) - self.started, 3),
+      "latencyms": {"mean": round(float(latencies.mean()), 2) if latencies.size else None, **percentiles(self.latencies)},
+      "deadlinemisses": self.misses,
+    }
+
+
+class MatchHost():
+  # plays many matches at once on one event loop. Every AI move of every
+  # match goes to one shared process pool, earliest deadline first, one
+  # move per worker, and a move's search gets whatever is left of its
+  # deadline when a worker takes it. Moves due within quickmilliseconds
+  # are quick and always have a worker kept for them, so long searches on
+  # big boards can not starve quick small board games
+  dispatchmargin = 0.02
+  quickmilliseconds = 250
+
+  def __init__(self, workers = None, tablesize = 2 ** 16, rolloutpolicy = "threat"):
+    if rolloutpolicy not in rolloutpolicies:
+      raise ValueError("unknown rollout policy: {}".format(rolloutpolicy))
+    self.workers = workers or os.cpu_count()
+    self.rolloutpolicy = rolloutpolicy
+    self.pool = concurrent.futures.ProcessPoolExecutor(self.workers, initializer = startserviceworker, initargs = (tablesize,))
+    for future in [self.pool.submit(int) for i in range(self.workers)]:
+      future.result()
+    self.free = self.workers
+    self.longsearches = 0
+    self.pending = []
+    self.sequence = itertools.count()
+    self.matchids = itertools.count(1)
+    self.matches = {}
+    self.started = time.perf_counter()
+    self.scheduler = None
+    self.wakeup = None
+    self.timer = None
+
+  def startscheduler(self):
+    if self.scheduler is None:
+      self.wakeup = asyncio.Event()
+      self.scheduler = asyncio.get_running_loop().create_task(self.schedule())
+
+  async def aimove(self, match):
+    # the AI's move for match, searched before its deadline if a worker
+    # frees up in time
+    self.startscheduler()
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    deadline = loop.time() + match.milliseconds / 1000
+    heapq.heappush(self.pending, (deadline, next(self.sequence), match, future))
+    self.wakeup.set()
+    return await future
+
+  async def schedule(self):
+    loop = asyncio.get_running_loop()
+    while True:
+      await self.wakeup.wait()
+      self.wakeup.clear()
+      while self.pending and self.free:
+        now = loop.time()
+        quick = self.pending[0][0] - now <= self.quickmilliseconds / 1000
+        # long searches leave one worker for quick moves; a long move held
+        # back turns quick as its deadline nears, and the scheduler wakes
+        # then to look at it again
+        if not quick and self.longsearches >= self.workers - 1 and self.workers > 1:
+          if self.timer is not None:
+            self.timer.cancel()
+          self.timer = loop.call_at(self.pending[0][0] - self.quickmilliseconds / 1000, self.wakeup.set)
+          break
+        deadline, sequence, match, future = heapq.heappop(self.pending)
+        if future.cancelled():
+          continue
+        # a move that waited too long still gets one search iteration
+        board = match.board
+        milliseconds = max(1, 1000 * (deadline - now - self.dispatchmargin))
+        query = (board.boardsize, board.winlinelen, board.numplayers, tuple(board.playerarray().ravel().tolist()), board.turnnum, milliseconds, None)
+        self.free -= 1
+        self.longsearches += not quick
+        search = loop.run_in_executor(self.pool, suggestmoves, [query], random.getrandbits(32), self.rolloutpolicy)
+        search.add_done_callback(lambda done, future = future, quick = quick: self.searched(done, future, quick))
+
+  def searched(self, done, future, quick):
+    self.free += 1
+    self.longsearches -= not quick
+    self.wakeup.set()
+    if future.cancelled():
+      return
+    if done.exception() is not None:
+      future.set_exception(done.exception())
+    elif "error" in done.result()[0]:
+      future.set_exception(RuntimeError(done.result()[0]["error"]))
+    else:
+      future.set_result(tuple(done.result()[0]["move"]))
+
+  def newmatch(self, boardsize, winlinelen, numplayers = 2, milliseconds = 200, connection = None, humans = 0):
+    match = Match(next(self.matchids), boardsize, winlinelen, numplayers, milliseconds, connection, humans)
+    self.matches[match.matchid] = match
+    return match
+
+  async def send(self, match, message):
+    if match.connection is not None:
+      match.connection.write(json.dumps(message).encode() + b"\n")
+      await match.connection.drain()
+
+  async def playmatch(self, match):
+    loop = asyncio.get_running_loop()
+    board = match.board
+    try:
+      while board.endgame() < 0:
+        if board.turnnum in board.humanturnnums:
+          await self.send(match, match.state())
+          move = await match.moves.get()
+          if move is None:
+            match.abandoned = True
+            break
+          if not (0 <= move[0] < board.boardsize and 0 <= move[1] < board.boardsize) or board.makenextplay(move) is False:
+            await self.send(match, {"match": match.matchid, "error": "illegal move {}".format(list(move))})
+          continue
+        start = loop.time()
+        move = await self.aimove(match)
+        latency = loop.time() - start
+        match.latencies.append(1000 * latency)
+        match.misses += latency > match.milliseconds / 1000
+        board.makenextplay(move)
+      match.finished = time.perf_counter()
+      if not match.abandoned:
+        await self.send(match, dict(match.state(), yourturn = False, winner = board.endgame()))
+    except (ConnectionError, OSError):
+      match.abandoned = True
+      match.finished = time.perf_counter()
+    return match
+
+  async def handle(self, reader, writer):
+    # one local player connection, which may play several matches at once
+    mine = []
+    try:
+      while True:
+        line = await reader.readline()
+        if not line:
+          break
+        try:
+          message = json.loads(line)
+          if message.get("command")  ==  "play":
+            boardsize, winlinelen = int(message["boardsize"]), int(message["winlinelen"])
+            numplayers, humans = int(message.get("numplayers", 2)), int(message.get("humans", 1))
+            milliseconds = float(message.get("milliseconds", 200))
+            if not 2 <= boardsize <= 19 or not 2 <= winlinelen <= 8 or not 2 <= numplayers <= 8:
+              raise ValueError("unsupported board configuration")
+            if not 1 <= humans <= numplayers or not milliseconds > 0:
+              raise ValueError("humans must be from 1 to numplayers and milliseconds above 0")
+            match = self.newmatch(boardsize, winlinelen, numplayers, milliseconds, writer, humans)
+            mine.append(match)
+            asyncio.get_running_loop().create_task(self.playmatch(match))
+          elif message.get("command")  ==  "report":
+            writer.write(json.dumps(self.report()).encode() + b"\n")
+          else:
+            match = self.matches.get(int(message["match"]))
+            if match is None or match.connection is not writer:
+              raise ValueError("unknown match {}".format(message["match"]))
+            move = tuple(int(i) for i in message["move"])
+            if len(move) != 2:
+              raise ValueError("a move is [row, col]")
+            match.moves.put_nowait(move)
+        except (KeyError, TypeError, ValueError, AttributeError) as error:
+          writer.write(json.dumps({"error": "bad request: {}".format(error)}).encode() + b"\n")
+        await writer.drain()
+    except (ConnectionError, OSError):
+      pass
+    finally:
+      for match in mine:
+        if match.finished is None:
+          match.moves.put_nowait(None)
+      writer.close()
+
+  async def run(self, matches):
+    # plays matches to the end concurrently
+    return await asyncio.gather(*[self.playmatch(match) for match in matches])
+
+  def report(self):
+    matches = list(self.matches.values())
+    elapsed = time.perf_counter() - self.started
+    moves = sum(len(match.board.moves) for match in matches)
+    latencies = [latency for match in matches for latency in match.latencies]
+    configs = {}
+    for match in matches:
+      configs.setdefault(match.config, []).append(match)
+    return {
+      "matches": len(matches),
+      "finished": sum(match.finished is not None for match in matches),
+      "workers": self.workers,
+      "seconds": round(elapsed, 3),
+      "moves": moves,
+      "aimoves": len(latencies),
+      "movespersecond": round(moves / elapsed, 2) if elapsed else 0.0,
+      "latencyms": percentiles(latencies),
+      "deadlinemisses": sum(match.misses for match in matches),
+      "configs": {config: {"matches": len(group), "milliseconds": group[0].milliseconds,
+                           "latencyms": percentiles([latency for match in group for latency in match.latencies]),
+                           "deadlinemisses": sum(match.misses for match in group)} for config, group in configs.items()},
+      "permatch": [match.summary() for match in matches],
+    }
+
+  def shutdown(self):
+    if self.timer is not None:
+      self.timer.cancel()
+    if self.scheduler is not None:
+      self.scheduler.cancel()
+    self.pool.shutdown(cancel_futures = True)
+
+
+def parsematches(spec):
+  # "7x7-4:20@500" -> 20 matches on 7x7, line 4, 500ms per AI move;
+  # the count and deadline are optional and "/3" after the line sets the
+  # player count
+  try:
+    config, _, rest = spec.partition(":")
+    count, _, milliseconds = rest.partition("@")
+    size, _, line = config.partition("-")
+    line, _, players = line.partition("/")
+    return int(size.partition("x")[0]), int(line), int(players or 2), int(count or 1), float(milliseconds or 200)
+  except ValueError:
+    raise argparse.ArgumentTypeError("match spec {!r} should look like 7x7-4:20@500".format(spec))
+
+
+def printreport(report):
+  print("{matches} matches ({finished} finished) on {workers} workers in {seconds:.1f}s: {moves} moves, "
+        "{movespersecond:.1f} moves/s, {deadlinemisses} AI moves past their deadline".format(**report))
+  print("{:<14} {:>8} {:>8} {:>9} {:>9} {:>9} {:>9} {:>7}".format("config", "matches", "ms", "p50", "p90", "p99", "max", "missed"))
+  for config, stats in sorted(report["configs"].items()):
+    latency = stats["latencyms"]
+    print("{:<14} {:>8} {:>8.0f} {:>9} {:>9} {:>9} {:>9} {:>7}".format(config, stats["matches"], stats["milliseconds"], str(latency["p50"]),
+                                                                       str(latency["p90"]), str(latency["p99"]), str(latency["max"]), stats["deadlinemisses"]))
+
+
+async def host(args):
+  matchhost = MatchHost(args.workers, args.table, args.rollouts)
+  try:
+    server = None
+    if args.unix:
+      server = await asyncio.start_unix_server(matchhost.handle, args.unix)
+    elif args.port:
+      server = await asyncio.start_server(matchhost.handle, args.host, args.port)
+    matches = [matchhost.newmatch(size, line, players, milliseconds)
+               for size, line, players, count, milliseconds in args.matches for i in range(0, count)]
+    random.shuffle(matches)
+    if matches:
+      await matchhost.run(matches)
+      report = matchhost.report()
+      if args.json:
+        print(json.dumps(report, indent = 2))
+      else:
+        printreport(report)
+    if server is not None:
+      logger.info("hosting matches on %s", args.unix or "{}:{}".format(args.host, args.port))
+      async with server:
+        await server.serve_forever()
+  finally:
+    matchhost.shutdown()
+    if args.unix and os.path.exists(args.unix):
+      os.unlink(args.unix)
+
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(prog = "python -m noughts.host", description = "Host many concurrent matches on one search pool.")
+  parser.add_argument("--match", dest = "matches", type = parsematches, action = "append", default = [],
+                      help = "AI only matches to play, e.g. 3x3-3:200@100 or 7x7-4:20@500; repeat for a mix")
+  parser.add_argument("--unix", help = "accept player connections on this Unix socket")
+  parser.add_argument("--host", default = "127.0.0.1")
+  parser.add_argument("--port", type = int, default = None, help = "accept player connections on this TCP port")
+  parser.add_argument("--workers", type = int, default = None, help = "search processes, default one per core")
+  parser.add_argument("--table", type = int, default = 2 ** 16, help = "transposition table entries per worker")
+  parser.add_argument("--rollouts", choices = rolloutpolicies, default = "threat", help = "rollout policy")
+  parser.add_argument("--json", action = "store_true", help = "print the report, with every match, as JSON")
+  args = parser.parse_args(argv)
+  logging.basicConfig(level = logging.INFO, format = "%(asctime)s %(message)s")
+  if not args.matches and not args.unix and not args.port:
+    parser.error("give --match, --unix or --port")
+  try:
+    asyncio.run(host(args))
+  except KeyboardInterrupt:
+    pass
+
+
+if __name__  ==  "__main__":
+  main()
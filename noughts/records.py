@@ -0,0 +1,169 @@
+import argparse
+import os
+import struct
+import time
+
+import numpy as np
+
+from .board import BitBoard, gamevariables
+
+
+# each game is a fixed 16 byte header followed by its moves as flat cell
+# indices, one byte each or two on boards of more than 256 cells. Games are
+# only ever appended, so a log cut short by a crash loses at most its last
+# game
+headerdtype = np.dtype([("magic", "<u2"), ("version", "u1"), ("boardsize", "u1"), ("winlinelen", "u1"), ("numplayers", "u1"),
+                        ("winner", "u1"), ("humanturns", "u1"), ("nummoves", "<u2"), ("movebytes", "u1"), ("reserved", "u1"),
+                        ("time", "<u4")])
+headersize = headerdtype.itemsize
+magic = 0x524e
+version = 1
+
+
+def encodegame(boardsize, winlinelen, numplayers, winner, humanturnnums, moves, timestamp = None):
+  # humanturnnums is stored as a bitmask of seats, so at most 8 players
+  movebytes = 1 if boardsize ** 2 <= 256 else 2
+  header = np.zeros(1, dtype = headerdtype)
+  header["magic"] = magic
+  header["version"] = version
+  header["boardsize"] = boardsize
+  header["winlinelen"] = winlinelen
+  header["numplayers"] = numplayers
+  header["winner"] = winner
+  header["humanturns"] = sum(1 << int(turnnum) for turnnum in humanturnnums)
+  header["nummoves"] = len(moves)
+  header["movebytes"] = movebytes
+  header["time"] = int(time.time() if timestamp is None else timestamp)
+  cells = np.array([row * boardsize + col for row, col in moves], dtype = "u1" if movebytes  ==  1 else "<u2")
+  return header.tobytes() + cells.tobytes()
+
+
+def recordgame(path, board, timestamp = None):
+  # append a finished game to the log at path
+  if board.endgame() < 0:
+    raise ValueError("only finished games are recorded")
+  with open(path, "ab") as logfile:
+    logfile.write(encodegame(board.boardsize, board.winlinelen, board.numplayers, board.endgame(),
+                             board.humanturnnums, board.moves, timestamp))
+
+
+def appendgames(path, games):
+  # append many games at once, each a dict like the ones GameLog returns
+  with open(path, "ab") as logfile:
+    for game in games:
+      logfile.write(encodegame(game["boardsize"], game["winlinelen"], game["numplayers"], game["winner"],
+                               game["humanturnnums"], game["moves"], game.get("time")))
+
+
+class GameLog():
+  # read only view of a game log through a memory map. Opening it walks
+  # the headers once to find where each game starts; the games themselves
+  # are only read when asked for, one at a time or a chunk at a time as
+  # arrays
+  def __init__(self, path):
+    self.path = path
+    size = os.path.getsize(path)
+    self.data = np.memmap(path, dtype = np.uint8, mode = "r") if size else np.zeros(0, dtype = np.uint8)
+    buffer = memoryview(self.data)
+    offsets = []
+    offset = 0
+    while offset + headersize <= size:
+      recordmagic, nummoves, movebytes = struct.unpack_from("<H6xHB", buffer, offset)
+      if recordmagic != magic:
+        raise ValueError("{} is not a game log or is corrupt at byte {}".format(path, offset))
+      end = offset + headersize + nummoves * movebytes
+      if end > size:
+        # a game cut short while being written
+        break
+      offsets.append(offset)
+      offset = end
+    self.offsets = np.array(offsets, dtype = np.int64)
+    self.headers = self.data[self.offsets[:, None] + np.arange(headersize)].view(headerdtype).ravel()
+
+  def __len__(self):
+    return self.offsets.size
+
+  def __getitem__(self, index):
+    header = self.headers[index]
+    start = int(self.offsets[index]) + headersize
+    movetype = "u1" if header["movebytes"]  ==  1 else "<u2"
+    cells = self.data[start:start + int(header["nummoves"]) * int(header["movebytes"])].view(movetype)
+    boardsize = int(header["boardsize"])
+    return {
+      "boardsize": boardsize,
+      "winlinelen": int(header["winlinelen"]),
+      "numplayers": int(header["numplayers"]),
+      "winner": int(header["winner"]),
+      "humanturnnums": [turnnum for turnnum in range(0, 8) if int(header["humanturns"]) >> turnnum & 1],
+      "moves": [divmod(int(cell), boardsize) for cell in cells],
+      "time": int(header["time"]),
+    }
+
+  def __iter__(self):
+    for index in range(0, len(self)):
+      yield self[index]
+
+  def movearray(self, start = 0, stop = None):
+    # the moves of games start to stop as flat cell indices, one row per
+    # game padded with -1
+    headers = self.headers[start:stop]
+    offsets = self.offsets[start:stop] + headersize
+    width = int(headers["nummoves"].max()) if headers.size else 0
+    steps = np.arange(width)
+    valid = steps < headers["nummoves"][:, None].astype(np.int64)
+    movebytes = headers["movebytes"][:, None].astype(np.int64)
+    positions = np.where(valid, offsets[:, None] + steps * movebytes, 0)
+    cells = self.data[positions].astype(np.int16)
+    wide = valid & (movebytes  ==  2)
+    cells[wide] |= self.data[positions[wide] + 1].astype(np.int16) << 8
+    cells[~valid] = -1
+    return cells
+
+  def chunks(self, size = 65536):
+    # (headers, movearray) for every size games in turn, so a whole log
+    # can be analysed without holding all of it in memory
+    for start in range(0, len(self), size):
+      yield self.headers[start:start + size], self.movearray(start, start + size)
+
+
+def replay(game):
+  # the final position of a game from GameLog as a BitBoard
+  board = BitBoard(gamevariables(game["boardsize"], game["winlinelen"], game["numplayers"]))
+  board.humanturnnums = np.array(game["humanturnnums"], dtype = np.int64)
+  for move in game["moves"]:
+    board.makenextplay(move)
+  return board
+
+
+def summarise(log, chunksize = 65536):
+  # games, draws and wins by seat and average length for each board
+  # configuration in the log, worked out a chunk at a time
+  summary = {}
+  for headers, moves in log.chunks(chunksize):
+    configs = np.stack([headers["boardsize"], headers["winlinelen"], headers["numplayers"]], axis = 1)
+    for config in np.unique(configs, axis = 0):
+      chosen = np.all(configs  ==  config, axis = 1)
+      key = tuple(int(value) for value in config)
+      totals = summary.setdefault(key, {"games": 0, "moves": 0, "results": np.zeros(key[2] + 1, dtype = np.int64)})
+      totals["games"] += int(chosen.sum())
+      totals["moves"] += int(headers["nummoves"][chosen].sum())
+      totals["results"] += np.bincount(headers["winner"][chosen], minlength = key[2] + 1)
+  return summary
+
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(prog = "python -m noughts.records", description = "Summarise a game log.")
+  parser.add_argument("path")
+  parser.add_argument("--chunk", type = int, default = 65536, help = "games read at a time")
+  args = parser.parse_args(argv)
+  log = GameLog(args.path)
+  print("{} games in {}".format(len(log), args.path))
+  for (boardsize, winlinelen, numplayers), totals in sorted(summarise(log, args.chunk).items()):
+    results = totals["results"]
+    print("{0}x{0} line {1}, {2} players: {3} games, {4:.1f} moves/game, {5:.1%} drawn, wins by seat {6}".format(
+      boardsize, winlinelen, numplayers, totals["games"], totals["moves"] / totals["games"], results[0] / totals["games"],
+      " ".join("{:.1%}".format(wins / totals["games"]) for wins in results[1:])))
+
+
+if __name__  ==  "__main__":
+  main()
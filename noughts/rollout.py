@@ -0,0 +1,145 @@
+import random
+
+import numpy as np
+
+from .board import neighbourhoods
+
+
+def batchrollout(board, rollouts, stats = None):
+  # play rollouts random games from board at once, one row of the
+  # (rollouts, boardsize ** 2) array per game, all advancing in lockstep;
+  # stats, a SearchStats, counts the plies played
+  if stats is not None:
+    stats.rollouts += rollouts
+  if board.endgame() >= 0:
+    results = np.zeros(board.numplayers + 1, dtype = np.int64)
+    results[board.endgame()] = rollouts
+    return results
+  lines = board.winlines
+  boards = np.repeat(board.playerarray().reshape(1, -1), rollouts, axis = 0)
+  keys = np.random.random(boards.shape)
+  keys[boards != 0] = 2
+  order = np.argsort(keys, axis = 1)[:, :board.emptycells]
+  winners = np.zeros(rollouts, dtype = np.int64)
+  active = np.arange(rollouts)
+  turnnum = board.turnnum
+  for step in range(0, board.emptycells):
+    player = board.playernum(turnnum)
+    cells = order[active, step]
+    boards[active, cells] = player
+    if stats is not None:
+      stats.rolloutplies += active.size
+    segments = boards[active[:, None, None], lines.cellsegments[cells]]
+    won = np.any(np.all(segments  ==  player, axis = 2) & lines.cellvalid[cells], axis = 1)
+    winners[active[won]] = player
+    active = active[~won]
+    if active.size  ==  0:
+      break
+    turnnum = (turnnum + 1) % board.numplayers
+  return np.bincount(winners, minlength = board.numplayers + 1)
+
+
+def localrollout(board, limit, stats = None):
+  # one random game on a large board where each move is drawn from the
+  # cells near the stones, the list growing as stones are placed; a game
+  # still running after limit plies counts as a draw
+  boardsize = board.boardsize
+  nearcells = neighbourhoods(boardsize)[0]
+  rows, cols = board.candidatepositions()
+  cells = (rows * boardsize + cols).tolist()
+  listed = set(cells)
+  listed.update(cell for playerindex, cell in board.stones())
+  plies = 0
+  while cells and plies < limit and board.endgame() < 0:
+    index = random.randrange(0, len(cells))
+    cell = cells[index]
+    cells[index] = cells[-1]
+    cells.pop()
+    board.makenextplay(divmod(cell, boardsize))
+    plies += 1
+    for near in nearcells[cell]:
+      if near not in listed:
+        listed.add(near)
+        cells.append(near)
+  results = [0] * (board.numplayers + 1)
+  results[max(board.endgame(), 0)] = 1
+  if stats is not None:
+    stats.rollouts += 1
+    stats.rolloutplies += plies
+  return results
+
+
+def threatrollout(board, limit = None, stats = None):
+  # one game where each player completes a line when one stone short of
+  # it, else blocks the next opponent who could, else plays at random
+  # (near the stones on a large board). Stone counts per line and player
+  # are kept move by move, so both checks are a lookup; a game still
+  # running after limit plies counts as a draw
+  results = [0] * (board.numplayers + 1)
+  if board.endgame() >= 0:
+    results[board.endgame()] = 1
+    return results
+  lines = board.winlines
+  winlinelen = board.winlinelen
+  numplayers = board.numplayers
+  owners = [0] * board.boardsize ** 2
+  totals = [0] * len(lines.linecells)
+  counts = [[0] * len(lines.linecells) for playerindex in range(0, numplayers)]
+  # cells that complete a line for each player
+  winning = [set() for playerindex in range(0, numplayers)]
+
+  def place(cell, playerindex):
+    # True if the stone completes a line
+    owners[cell] = playerindex + 1
+    playercounts = counts[playerindex]
+    for lineindex in lines.celllinelists[cell]:
+      totals[lineindex] += 1
+      playercounts[lineindex] += 1
+      if playercounts[lineindex]  ==  winlinelen:
+        return True
+      if playercounts[lineindex]  ==  winlinelen - 1 and totals[lineindex]  ==  winlinelen - 1:
+        winning[playerindex].update(near for near in lines.linecells[lineindex] if not owners[near])
+    return False
+
+  for playerindex, cell in board.stones():
+    place(cell, playerindex)
+  rows, cols = board.candidatepositions()
+  cells = (rows * board.boardsize + cols).tolist()
+  nearcells = neighbourhoods(board.boardsize)[0] if board.largeboard else None
+  listed = set(cells)
+  turnnum = board.turnnum
+  plies = 0
+  while limit is None or plies < limit:
+    cell = None
+    for playerindex in [(turnnum + offset) % numplayers for offset in range(0, numplayers)]:
+      for candidate in winning[playerindex]:
+        if not owners[candidate]:
+          cell = candidate
+          break
+      if cell is not None:
+        break
+    while cell is None and cells:
+      index = random.randrange(0, len(cells))
+      candidate = cells[index]
+      cells[index] = cells[-1]
+      cells.pop()
+      if not owners[candidate]:
+        cell = candidate
+    if cell is None:
+      break
+    plies += 1
+    if place(cell, turnnum):
+      results[turnnum + 1] = 1
+      break
+    if nearcells is not None:
+      for near in nearcells[cell]:
+        if near not in listed:
+          listed.add(near)
+          cells.append(near)
+    turnnum = (turnnum + 1) % numplayers
+  if not any(results):
+    results[0] = 1
+  if stats is not None:
+    stats.rollouts += 1
+    stats.rolloutplies += plies
+  return results
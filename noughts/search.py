@@ -0,0 +1,648 @@
+import os
+import random
+import time
+import concurrent.futures
+import logging
+import multiprocessing
+from math import log
+
+import numpy as np
+
+from .board import largeboardsize
+from .book import bookmove
+from .exact import exactsearch
+from .rollout import batchrollout, localrollout, threatrollout
+
+
+logger = logging.getLogger(__name__)
+
+
+class TranspositionTable():
+  # bounded table from Zobrist hash to the node of a NodeStore holding the
+  # statistics for that position, so every node reaching the same position
+  # through a different move order shares them. Positions are filed under
+  # GameBoard.cachekey, which also merges rotations and reflections of
+  # opening positions. On a slot collision
+  # "always" replaces the resident entry, while "visits" keeps a resident
+  # entry that has been visited more than once during the current search
+  def __init__(self, size = 2 ** 16, replacement = "visits"):
+    if replacement not in ("always", "visits"):
+      raise ValueError("unknown replacement policy: {}".format(replacement))
+    self.size = size
+    self.replacement = replacement
+    self.keys = np.zeros(size, dtype = np.uint64)
+    self.nodes = np.full(size, -1, dtype = np.int32)
+    self.generations = np.zeros(size, dtype = np.int32)
+    self.generation = 0
+
+  def newsearch(self):
+    self.generation += 1
+
+  def clear(self):
+    self.nodes[:] = -1
+
+  def remap(self, newindex, holders = None):
+    # a slot whose node was dropped follows its statistics to the kept
+    # node they moved to, if any
+    stored = self.nodes >= 0
+    nodes = newindex[self.nodes[stored]]
+    if holders is not None:
+      nodes = np.where(nodes < 0, holders[self.nodes[stored]], nodes)
+    self.nodes[stored] = nodes
+
+  def lookup(self, key, node, store):
+    slot = key % self.size
+    resident = self.nodes[slot]
+    if resident >= 0 and int(self.keys[slot])  ==  key:
+      self.generations[slot] = self.generation
+      return resident
+    if resident < 0 or self.replacement  ==  "always" or self.generations[slot] != self.generation or store.visits[resident] <= 1:
+      self.keys[slot] = key
+      self.nodes[slot] = node
+      self.generations[slot] = self.generation
+    return node
+
+
+class NodeStore():
+  # struct of arrays UCT tree. The children of node i are the contiguous
+  # block firstchild[i] to firstchild[i] + numchildren[i], expanded ones
+  # first with untried[i] left to expand. stat[i] is the node whose visits
+  # and wins node i uses, itself unless it shares them with a transposition
+  fields = (("visits", np.float64), ("wins", np.float64), ("parent", np.int32), ("firstchild", np.int32),
+            ("numchildren", np.int16), ("untried", np.int16), ("action", np.int16), ("mover", np.int8),
+            ("terminal", np.bool_), ("stat", np.int32))
+
+  def __init__(self, capacity = 1024):
+    self.count = 0
+    self.shared = False
+    for name, dtype in self.fields:
+      setattr(self, name, np.zeros(capacity, dtype = dtype))
+
+  def reserve(self, size):
+    capacity = len(self.visits)
+    if self.count + size > capacity:
+      capacity = max(2 * capacity, self.count + size)
+      for name, dtype in self.fields:
+        array = np.zeros(capacity, dtype = dtype)
+        array[:self.count] = getattr(self, name)[:self.count]
+        setattr(self, name, array)
+
+  def allocate(self, size):
+    self.reserve(size)
+    first = self.count
+    self.count += size
+    block = slice(first, self.count)
+    self.visits[block] = 0
+    self.wins[block] = 0
+    self.firstchild[block] = -1
+    self.numchildren[block] = 0
+    self.untried[block] = 0
+    self.terminal[block] = False
+    self.stat[block] = np.arange(first, self.count)
+    return first
+
+  def addroot(self, board):
+    node = self.allocate(1)
+    self.parent[node] = -1
+    self.action[node] = -1
+    self.mover[node] = board.previousturnnum()
+    self.terminal[node] = board.endgame() >= 0
+    return node
+
+  def addchildren(self, node, board):
+    # symmetric moves lead to equivalent positions, so a new root lists
+    # only one of each. Deeper nodes list every move, or the reply the
+    # opponent actually plays could be missing when the tree is reused
+    if self.parent[node] < 0:
+      rows, cols = board.distinctpositions()
+    else:
+      rows, cols = board.candidatepositions()
+    first = self.allocate(len(rows))
+    block = slice(first, self.count)
+    self.parent[block] = node
+    self.action[block] = rows * board.boardsize + cols
+    self.mover[block] = board.turnnum
+    self.firstchild[node] = first
+    self.numchildren[node] = self.untried[node] = len(rows)
+
+  def children(self, node):
+    first = self.firstchild[node]
+    return np.arange(first, first + self.numchildren[node] - self.untried[node])
+
+  def expand(self, node):
+    # swap a random untried child to the end of the expanded run
+    child = int(self.firstchild[node]) + int(self.numchildren[node]) - int(self.untried[node])
+    chosen = child + random.randrange(0, int(self.untried[node]))
+    self.action[child], self.action[chosen] = self.action[chosen], self.action[child]
+    self.untried[node] -= 1
+    return child
+
+  def share(self, node, stat):
+    self.stat[node] = stat
+    if stat != node:
+      self.shared = True
+
+  def select(self, node):
+    first = int(self.firstchild[node])
+    last = first + int(self.numchildren[node]) - int(self.untried[node])
+    if self.shared:
+      stats = self.stat[first:last]
+      visits = self.visits[stats]
+      wins = self.wins[stats]
+    else:
+      visits = self.visits[first:last]
+      wins = self.wins[first:last]
+    ucb = wins / visits + 0.2 * np.sqrt(2 * log(self.visits[self.stat[node]]) / visits)
+    return first + int(ucb.argmax())
+
+  def update(self, node, board, results, rollouts):
+    # scoring 2 for each win and -1 for each loss of the player who moved
+    # into the node
+    decided = rollouts - results[0]
+    while node >= 0:
+      stat = self.stat[node]
+      wins = results[board.playernum(self.mover[node])]
+      self.visits[stat] += rollouts
+      self.wins[stat] += 2 * wins - (decided - wins)
+      node = int(self.parent[node])
+
+  def compact(self, root):
+    # keep only the subtree under root, laid out again from index 0, and
+    # return the old to new index map (with -1 for dropped nodes) and the
+    # kept node now holding the statistics of each dropped holder
+    firstchild = self.firstchild.tolist()
+    numchildren = self.numchildren.tolist()
+    keep = [root]
+    index = 0
+    while index < len(keep):
+      node = keep[index]
+      if firstchild[node] >= 0:
+        keep.extend(range(firstchild[node], firstchild[node] + numchildren[node]))
+      index += 1
+    keep = np.array(keep)
+    # one spare slot so that looking up -1 maps to -1
+    newindex = np.full(self.count + 1, -1, dtype = np.int32)
+    newindex[keep] = np.arange(len(keep))
+    oldvisits = self.visits
+    oldwins = self.wins
+    oldstat = self.stat[keep]
+    for name, dtype in self.fields:
+      setattr(self, name, getattr(self, name)[keep])
+    self.count = len(keep)
+    self.parent = newindex[self.parent]
+    self.firstchild = newindex[self.firstchild]
+    # statistics shared with a dropped node move to the first kept node
+    # that used them
+    stat = newindex[oldstat]
+    lost = np.flatnonzero(stat < 0)
+    moved = np.full_like(newindex, -1)
+    if lost.size:
+      lostfrom, first = np.unique(oldstat[lost], return_index = True)
+      holders = lost[first]
+      self.visits[holders] = oldvisits[lostfrom]
+      self.wins[holders] = oldwins[lostfrom]
+      stat[lost] = holders[np.searchsorted(lostfrom, oldstat[lost])]
+      moved[lostfrom] = holders
+    self.stat = stat
+    return newindex, moved
+
+
+class SearchTree():
+  # keeps the UCT tree between moves and re-roots it at the node matching
+  # the moves played since the last search
+  def __init__(self):
+    self.store = None
+    self.root = None
+    self.rootmoves = []
+    self.config = None
+
+  def rootfor(self, board, table = None):
+    config = (board.boardsize, board.winlinelen, board.numplayers)
+    node = None
+    if self.store is not None and config  ==  self.config and board.moves[:len(self.rootmoves)]  ==  self.rootmoves:
+      node = self.root
+      for row, col in board.moves[len(self.rootmoves):]:
+        children = self.store.children(node)
+        children = children[self.store.action[children]  ==  row * board.boardsize + col]
+        if children.size  ==  0:
+          node = None
+          break
+        node = children[0]
+    if node is None:
+      self.store = NodeStore()
+      self.root = self.store.addroot(board)
+      if table is not None:
+        table.clear()
+        self.store.share(self.root, table.lookup(board.cachekey(), self.root, self.store))
+    elif node != self.root:
+      newindex, moved = self.store.compact(node)
+      if table is not None:
+        table.remap(newindex, moved)
+      self.root = 0
+      self.store.parent[self.root] = -1
+    self.rootmoves = list(board.moves)
+    self.config = config
+    return self.root
+
+  def statistics(self):
+    children = self.store.children(self.root)
+    stats = self.store.stat[children]
+    return {divmod(int(action), self.config[0]): (float(visits), float(wins))
+            for action, visits, wins in zip(self.store.action[children], self.store.visits[stats], self.store.wins[stats])}
+
+  def bestaction(self):
+    statistics = self.statistics()
+    return max(statistics, key = lambda action: statistics[action][0])
+
+
+largeboardmilliseconds = 900
+
+
+class SearchBudget():
+  # how long a search may run: a time limit, an iteration limit or both,
+  # whichever runs out first. The clock and the optional stop flag are only
+  # read once every checkinterval iterations
+  def __init__(self, milliseconds = None, iterations = None, checkinterval = 32, stop = None):
+    if milliseconds is None and iterations is None:
+      raise ValueError("a search budget needs milliseconds, iterations or both")
+    self.milliseconds = milliseconds
+    self.iterations = iterations
+    self.checkinterval = checkinterval
+    self.stop = stop
+
+  @classmethod
+  def fordifficulty(cls, difficulty, boardsize = None):
+    # large board iterations are slow, so the clock is read more often and
+    # a move is capped below a second
+    if boardsize is not None and boardsize >= largeboardsize:
+      return cls(milliseconds = min(500 * difficulty, largeboardmilliseconds), checkinterval = 4)
+    return cls(milliseconds = 500 * difficulty)
+
+  def withstop(self, stop):
+    return SearchBudget(self.milliseconds, self.iterations, self.checkinterval, stop)
+
+  def scaled(self, timefraction, iterationfactor = 1):
+    return SearchBudget(None if self.milliseconds is None else self.milliseconds * timefraction,
+                        None if self.iterations is None else self.iterations * iterationfactor, self.checkinterval, self.stop)
+
+  def deadline(self):
+    if self.milliseconds is None:
+      return None
+    return time.perf_counter() + self.milliseconds / 1000
+
+  def exhausted(self, iterations, deadline):
+    if self.iterations is not None and iterations >= self.iterations:
+      return True
+    if iterations % self.checkinterval:
+      return False
+    if self.stop is not None and self.stop.is_set():
+      return True
+    return deadline is not None and time.perf_counter() >= deadline
+
+
+class SearchStats():
+  # where a search spent its time; only filled in when a search is
+  # instrumented, so the plain search loop never reads the clock per phase
+  phases = ("selection", "expansion", "simulation", "backpropagation")
+
+  def __init__(self):
+    self.iterations = 0
+    self.times = dict.fromkeys(self.phases, 0.0)
+    self.elapsed = 0.0
+    self.treesize = 0
+    self.maxdepth = 0
+    self.rollouts = 0
+    self.rolloutplies = 0
+    self.stoppedby = None
+    self.searches = 1
+    # time spent on the opening book and exact search before the tree
+    self.shortcuttime = 0.0
+    self.last = time.perf_counter()
+
+  def mark(self):
+    self.last = time.perf_counter()
+
+  def lap(self, phase):
+    now = time.perf_counter()
+    self.times[phase] += now - self.last
+    self.last = now
+
+  def rolloutlength(self):
+    return self.rolloutplies / self.rollouts if self.rollouts else 0.0
+
+  def merge(self, other):
+    # totals over several searches, e.g. the workers of a parallel search
+    self.iterations += other.iterations
+    for phase in self.phases:
+      self.times[phase] += other.times[phase]
+    self.elapsed = max(self.elapsed, other.elapsed)
+    self.treesize += other.treesize
+    self.maxdepth = max(self.maxdepth, other.maxdepth)
+    self.rollouts += other.rollouts
+    self.rolloutplies += other.rolloutplies
+    self.stoppedby = self.stoppedby or other.stoppedby
+    self.searches += other.searches
+    self.shortcuttime += other.shortcuttime
+    return self
+
+  def asdict(self):
+    return {
+      "iterations": self.iterations,
+      "times": dict(self.times),
+      "elapsed": self.elapsed,
+      "treesize": self.treesize,
+      "maxdepth": self.maxdepth,
+      "rollouts": self.rollouts,
+      "rolloutlength": self.rolloutlength(),
+      "stoppedby": self.stoppedby,
+      "searches": self.searches,
+      "shortcuttime": self.shortcuttime,
+    }
+
+  def __str__(self):
+    phasetime = sum(self.times.values()) or 1.0
+    return "{} iterations in {:.0f}ms ({}, {} searches, {:.0f}ms before the tree), tree {} nodes, depth {}, rollout {:.1f} plies; {}".format(
+      self.iterations, 1000 * self.elapsed, self.stoppedby, self.searches, 1000 * self.shortcuttime, self.treesize, self.maxdepth, self.rolloutlength(),
+      ", ".join("{} {:.0%}".format(phase, self.times[phase] / phasetime) for phase in self.phases))
+
+
+rolloutpolicies = ("uniform", "threat")
+
+# rollouts on large boards stop after this many plies per board width,
+# which most random games there finish within
+localrolloutplies = 8
+
+# two player positions are tried with the exact search first when they
+# have at most exactcells[winlinelen] empty cells, about as many as it
+# solves in exactseconds; each doubling of its share of a time budget
+# allows one cell more. It gets exacttimeshare of the time budget and
+# exactnodesperiteration positions per UCT iteration of an iteration budget
+exactcells = {2: 16, 3: 16, 4: 12, 5: 11, 6: 11, 7: 10, 8: 10}
+exactseconds = 0.25
+exacttimeshare = 0.5
+exactnodesperiteration = 16
+
+
+def exactfits(rootstate, budget):
+  # whether the exact search is likely to solve rootstate within its share
+  # of budget. It can not prune without a segment either player could
+  # still complete, and such a position is a known draw anyway
+  if rootstate.numplayers != 2:
+    return False
+  cells = exactcells.get(rootstate.winlinelen, 0)
+  if budget.milliseconds is not None:
+    cells += int(np.floor(np.log2(max(budget.milliseconds * exacttimeshare / 1000, 1e-3) / exactseconds)))
+  if rootstate.emptycells > cells:
+    return False
+  segments = rootstate.playerarray().ravel()[rootstate.winlines.lines]
+  return bool(np.any(np.all(segments != 1, axis = 1) | np.all(segments != 2, axis = 1)))
+
+
+def shortcut(rootstate, budget, usebook = True, useexact = True, stats = None):
+  # a move without the tree search: from the opening book, or from the
+  # exact search if it solves the position within its share of the budget.
+  # Returns the move or None, what found it and the budget left over; the
+  # time it took goes into stats
+  start = time.perf_counter()
+  move, foundby = None, None
+  if usebook:
+    move = bookmove(rootstate)
+    foundby = "book" if move is not None else None
+  if move is None and useexact and exactfits(rootstate, budget):
+    searcher = exactsearch(rootstate.boardsize, rootstate.winlinelen)
+    move, score, solved = searcher.search(rootstate, budget.scaled(exacttimeshare, exactnodesperiteration))
+    if solved:
+      foundby = "exact"
+    else:
+      move = None
+      if budget.milliseconds is not None:
+        budget = SearchBudget(max(0, budget.milliseconds - 1000 * (time.perf_counter() - start)), budget.iterations, budget.checkinterval, budget.stop)
+  if stats is not None:
+    spent = time.perf_counter() - start
+    stats.shortcuttime += spent
+    stats.elapsed += spent
+    stats.stoppedby = foundby
+  return move, foundby, budget
+
+
+def Negamax(rootstate, budget):
+  # the exact engine on its own, called like UCT; an iteration budget
+  # counts searched positions
+  if not isinstance(budget, SearchBudget):
+    budget = SearchBudget(iterations = budget)
+  return exactsearch(rootstate.boardsize, rootstate.winlinelen).search(rootstate, budget)[0]
+
+
+def UCT(rootstate, budget, rollouts = 1, tree = None, table = None, instrument = False, usebook = True, useexact = True, rolloutpolicy = "uniform"):
+  # solved positions are answered from the opening book and small two
+  # player ones by exact search before growing the tree; with instrument
+  # the move comes back together with its SearchStats
+  if not isinstance(budget, SearchBudget):
+    budget = SearchBudget(iterations = budget)
+  stats = SearchStats() if instrument else None
+  move, foundby, budget = shortcut(rootstate, budget, usebook, useexact, stats)
+  if not instrument:
+    return move or UCTsearch(rootstate, budget, rollouts, tree, table, rolloutpolicy = rolloutpolicy).bestaction()
+  if move is None:
+    move = UCTsearch(rootstate, budget, rollouts, tree, table, stats, rolloutpolicy).bestaction()
+  logger.info("UCT move %s: %s", move, stats)
+  return move, stats
+
+
+def UCTsearch(rootstate, budget, rollouts = 1, tree = None, table = None, stats = None, rolloutpolicy = "uniform"):
+  # anytime search: it always completes at least one iteration and the tree
+  # holds the best move found so far whenever the budget runs out. Single
+  # rollouts are uniformly random or, with the "threat" policy, take and
+  # block immediate wins
+  if rolloutpolicy not in rolloutpolicies:
+    raise ValueError("unknown rollout policy: {}".format(rolloutpolicy))
+  if not isinstance(budget, SearchBudget):
+    budget = SearchBudget(iterations = budget)
+  start = time.perf_counter()
+  deadline = budget.deadline()
+  if tree is None:
+    tree = SearchTree()
+  if table is not None:
+    table.newsearch()
+  root = tree.rootfor(rootstate, table)
+  store = tree.store
+
+  iterations = 0
+  while True:
+    if stats is not None:
+      stats.mark()
+    node = root
+    depth = 0
+    boardsim = rootstate.clone()
+
+    # selection - select best child while fully expanded and not terminal
+    while not store.terminal[node] and store.firstchild[node] >= 0 and store.untried[node]  ==  0:
+      node = store.select(node)
+      depth += 1
+      boardsim.makenextplay(divmod(int(store.action[node]), boardsim.boardsize))
+    if stats is not None:
+      stats.lap("selection")
+
+    # expansion - expand to a random untried action, listing the node's
+    # actions the first time it is expanded
+    if not store.terminal[node]:
+      if store.firstchild[node] < 0:
+        store.addchildren(node, boardsim)
+      node = store.expand(node)
+      boardsim.makenextplay(divmod(int(store.action[node]), boardsim.boardsize))
+      store.terminal[node] = boardsim.endgame() >= 0
+      if table is not None:
+        store.share(node, table.lookup(boardsim.cachekey(), node, store))
+      depth += 1
+    if stats is not None:
+      stats.lap("expansion")
+      stats.maxdepth = max(stats.maxdepth, depth)
+
+    # simulation - rollout to terminal state from current
+    # state using random actions, one game at a time or as a batch
+    if rollouts > 1:
+      results = batchrollout(boardsim, rollouts, stats)
+    elif rolloutpolicy  ==  "threat":
+      results = threatrollout(boardsim, localrolloutplies * boardsim.boardsize if boardsim.largeboard else None, stats)
+    elif boardsim.largeboard:
+      results = localrollout(boardsim, localrolloutplies * boardsim.boardsize, stats)
+    else:
+      rolloutactions = list(zip(*boardsim.availablepositions()))
+      random.shuffle(rolloutactions)
+      plies = 0
+      for position in rolloutactions:
+        if boardsim.endgame() >= 0:
+          break
+        boardsim.makenextplay(position)
+        plies += 1
+      results = [0] * (boardsim.numplayers + 1)
+      results[boardsim.endgame()] = 1
+      if stats is not None:
+        stats.rollouts += 1
+        stats.rolloutplies += plies
+    if stats is not None:
+      stats.lap("simulation")
+
+    # backpropagation - propagate result of rollout games up the tree
+    store.update(node, boardsim, results, rollouts)
+    if stats is not None:
+      stats.lap("backpropagation")
+
+    iterations += 1
+    if budget.exhausted(iterations, deadline):
+      break
+
+  if stats is not None:
+    stats.iterations += iterations
+    stats.elapsed += time.perf_counter() - start
+    stats.treesize = store.count
+    if budget.iterations is not None and iterations >= budget.iterations:
+      stats.stoppedby = "iterations"
+    elif budget.stop is not None and budget.stop.is_set():
+      stats.stoppedby = "stop"
+    else:
+      stats.stoppedby = "deadline"
+  return tree
+
+
+workertree = SearchTree()
+workertable = None
+workerstop = None
+# the search id and root statistics this worker last returned
+workerreported = (None, {})
+
+def startworker(tablesize, replacement, stop):
+  global workertable, workerstop
+  if tablesize:
+    workertable = TranspositionTable(tablesize, replacement)
+  workerstop = stop
+
+def rootstatistics(rootstate, budget, rollouts, seed, instrument = False, rolloutpolicy = "uniform", searchid = None):
+  # runs in a worker process, so reseed rather than reuse the forked state;
+  # each worker keeps its own tree and table between moves. The pool may
+  # hand one worker two tasks of the same search, and the second grows
+  # the same tree, so it returns only what it added
+  global workerreported
+  random.seed(seed)
+  np.random.seed(seed)
+  stats = SearchStats() if instrument else None
+  statistics = UCTsearch(rootstate, budget.withstop(workerstop), rollouts, workertree, workertable, stats, rolloutpolicy).statistics()
+  reportedid, reported = workerreported
+  workerreported = (searchid, statistics)
+  if searchid is None or searchid != reportedid:
+    return statistics, stats
+  added = {}
+  for action, (visits, wins) in statistics.items():
+    before = reported.get(action, (0, 0))
+    added[action] = (visits - before[0], wins - before[1])
+  return added, stats
+
+
+class ParallelUCT():
+  # root parallel UCT: every worker grows its own tree from the same root
+  # under the same budget and the root children's statistics are summed.
+  # With instrument a search returns the move together with its SearchStats,
+  # like UCT
+  def __init__(self, workers = None, tablesize = None, replacement = "visits", instrument = False, usebook = True, useexact = True, rolloutpolicy = "uniform"):
+    if rolloutpolicy not in rolloutpolicies:
+      raise ValueError("unknown rollout policy: {}".format(rolloutpolicy))
+    self.workers = workers or os.cpu_count()
+    self.rolloutpolicy = rolloutpolicy
+    self.instrument = instrument
+    self.usebook = usebook
+    self.useexact = useexact
+    self.stopflag = multiprocessing.Event()
+    self.pool = concurrent.futures.ProcessPoolExecutor(self.workers, initializer = startworker, initargs = (tablesize, replacement, self.stopflag))
+    self.thread = concurrent.futures.ThreadPoolExecutor(1)
+    # start the workers now rather than on the first move
+    for future in [self.pool.submit(int) for i in range(self.workers)]:
+      future.result()
+
+  def search(self, rootstate, budget, rollouts = 1):
+    if not isinstance(budget, SearchBudget):
+      budget = SearchBudget(iterations = budget)
+    # the workers share the pool's stop flag, so drop any other one
+    self.stopflag.clear()
+    start = time.perf_counter()
+    stats = SearchStats() if self.instrument else None
+    move, foundby, budget = shortcut(rootstate, budget.withstop(self.stopflag), self.usebook, self.useexact, stats)
+    if move is None:
+      move, searchstats = self.searchtree(rootstate, budget.withstop(None), rollouts)
+      if stats is not None:
+        searchstats.shortcuttime = stats.shortcuttime
+        stats = searchstats
+    if stats is None:
+      return move
+    stats.elapsed = time.perf_counter() - start
+    logger.info("ParallelUCT move %s: %s", move, stats)
+    return move, stats
+
+  def searchtree(self, rootstate, budget, rollouts):
+    searchid = random.getrandbits(64)
+    futures = [self.pool.submit(rootstatistics, rootstate, budget, rollouts, random.getrandbits(32), self.instrument, self.rolloutpolicy, searchid)
+               for i in range(self.workers)]
+    statistics = {}
+    searchstats = None
+    for future in futures:
+      rootstats, stats = future.result()
+      for action, (visits, wins) in rootstats.items():
+        totals = statistics.setdefault(action, [0, 0])
+        totals[0] += visits
+        totals[1] += wins
+      if stats is not None:
+        searchstats = stats if searchstats is None else searchstats.merge(stats)
+    return max(statistics, key = lambda action: statistics[action][0]), searchstats
+
+  def submit(self, rootstate, budget, rollouts = 1):
+    # search off the calling thread on a copy of the board; the returned
+    # future resolves to what search returns
+    return self.thread.submit(self.search, rootstate.clone(), budget, rollouts)
+
+  def stop(self):
+    # ends the running search early with the best move found so far
+    self.stopflag.set()
+
+  def shutdown(self):
+    self.stop()
+    self.thread.shutdown(cancel_futures = True)
+    self.pool.shutdown(cancel_futures = True)
@@ -0,0 +1,329 @@
+import argparse
+import concurrent.futures
+import json
+import logging
+import os
+import queue
+import random
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from . import search
+from .board import BitBoard, gamevariables, largeboardsize
+from .search import SearchBudget, UCT, rolloutpolicies
+
+
+logger = logging.getLogger(__name__)
+
+# the protocol is one JSON object per line each way. A move request is
+#   {"id": 7, "boardsize": 3, "winlinelen": 3, "numplayers": 2,
+#    "positions": [[1, 0, 0], [0, 2, 0], [0, 0, 0]], "turnnum": 0,
+#    "milliseconds": 200}
+# with positions laid out like playerarray(), 0 for an empty cell and
+# playernum for a stone, and turnnum the index of the player to move.
+# "milliseconds" defaults to the longest a search may run and "iterations"
+# may stop it sooner. The answer is
+#   {"id": 7, "move": [row, col]} or {"id": 7, "error": "..."}
+# and {"command": "stats"} returns the queue depth and latency percentiles
+
+
+def parsequery(message, maxmilliseconds):
+  # a checked, hashable query from a request, so identical requests can
+  # share one search
+  try:
+    boardsize = int(message["boardsize"])
+    winlinelen = int(message["winlinelen"])
+    numplayers = int(message["numplayers"])
+    positions = np.array(message["positions"], dtype = np.int64)
+    milliseconds = message.get("milliseconds")
+    iterations = message.get("iterations")
+    milliseconds = None if milliseconds is None else float(milliseconds)
+    iterations = None if iterations is None else int(iterations)
+  except (KeyError, TypeError, ValueError) as error:
+    raise ValueError("bad request: {}".format(error))
+  if not 2 <= boardsize <= 19 or not 2 <= winlinelen <= 8 or not 2 <= numplayers <= 8:
+    raise ValueError("unsupported board configuration")
+  if positions.shape != (boardsize, boardsize) or positions.min() < 0 or positions.max() > numplayers:
+    raise ValueError("positions must be a {0}x{0} grid of 0 to {1}".format(boardsize, numplayers))
+  turnnum = int(message.get("turnnum", np.count_nonzero(positions) % numplayers))
+  if not 0 <= turnnum < numplayers:
+    raise ValueError("turnnum must be from 0 to {}".format(numplayers - 1))
+  # every search has a time limit, so an iteration count can not hold a
+  # worker past maxmilliseconds
+  if milliseconds is None:
+    milliseconds = maxmilliseconds
+  if not 0 < milliseconds <= maxmilliseconds:
+    raise ValueError("milliseconds must be above 0 and at most {}".format(maxmilliseconds))
+  if iterations is not None and iterations < 1:
+    raise ValueError("iterations must be at least 1")
+  return (boardsize, winlinelen, numplayers, tuple(positions.ravel().tolist()), turnnum, milliseconds, iterations)
+
+
+def queryboard(query):
+  boardsize, winlinelen, numplayers, cells, turnnum = query[:5]
+  board = BitBoard(gamevariables(boardsize, winlinelen, numplayers))
+  # the winner is worked out from the player who moved last
+  board.turnnum = turnnum
+  board.positions = np.array(board.gametokens)[np.array(cells).reshape(boardsize, boardsize)]
+  return board
+
+
+def startserviceworker(tablesize):
+  # each worker keeps one transposition table for every request it serves
+  search.startworker(tablesize, "visits", None)
+
+
+def suggestmoves(queries, seed, rolloutpolicy):
+  # runs in a worker process: the move for each query in turn
+  random.seed(seed)
+  np.random.seed(seed)
+  results = []
+  for query in queries:
+    board = queryboard(query)
+    if board.endgame() >= 0 or any(board.haswon(mask) for mask in board.masks):
+      results.append({"error": "the game is over"})
+      continue
+    milliseconds, iterations = query[5:]
+    budget = SearchBudget(milliseconds, iterations, checkinterval = 4 if board.boardsize >= largeboardsize else 32)
+    move = UCT(board, budget, table = search.workertable, rolloutpolicy = rolloutpolicy)
+    results.append({"move": [int(move[0]), int(move[1])]})
+  return results
+
+
+def percentiles(values):
+  if not values:
+    return {"p50": None, "p90": None, "p99": None, "max": None}
+  p50, p90, p99, top = np.percentile(np.array(values), [50, 90, 99, 100])
+  return {"p50": round(p50, 2), "p90": round(p90, 2), "p99": round(p99, 2), "max": round(top, 2)}
+
+
+class MoveService():
+  # move suggestions from a pool of warm worker processes. Requests wait
+  # in one queue and each free worker takes the next one, so no request
+  # waits on another's search. A request identical to one already queued
+  # or being searched joins that search instead of queueing its own.
+  # Latencies are in milliseconds from the request arriving, so they
+  # include the time spent queued
+  def __init__(self, workers = None, tablesize = 2 ** 16, maxmilliseconds = 10000, rolloutpolicy = "threat", history = 10000):
+    if rolloutpolicy not in rolloutpolicies:
+      raise ValueError("unknown rollout policy: {}".format(rolloutpolicy))
+    self.workers = workers or os.cpu_count()
+    self.maxmilliseconds = maxmilliseconds
+    self.rolloutpolicy = rolloutpolicy
+    self.queue = queue.Queue()
+    self.free = threading.Semaphore(self.workers)
+    self.lock = threading.Lock()
+    # the requests waiting on each query that is queued or being searched
+    self.waiting = {}
+    self.inflight = 0
+    self.served = 0
+    self.searches = 0
+    self.joined = 0
+    self.errors = 0
+    self.latencies = deque(maxlen = history)
+    self.waits = deque(maxlen = history)
+    self.started = time.perf_counter()
+    self.pool = concurrent.futures.ProcessPoolExecutor(self.workers, initializer = startserviceworker, initargs = (tablesize,))
+    # start the workers and build their tables now rather than on the first request
+    for future in [self.pool.submit(int) for i in range(self.workers)]:
+      future.result()
+    self.dispatcher = threading.Thread(target = self.dispatch, daemon = True)
+    self.dispatcher.start()
+
+  def request(self, message):
+    # a future that resolves to the response for message, without any socket
+    future = concurrent.futures.Future()
+    if message.get("command")  ==  "stats":
+      future.set_result(self.stats())
+      return future
+    try:
+      query = parsequery(message, self.maxmilliseconds)
+    except ValueError as error:
+      with self.lock:
+        self.errors += 1
+      future.set_result({"error": str(error)})
+      return future
+    with self.lock:
+      if query in self.waiting:
+        self.waiting[query].append((future, time.perf_counter()))
+        self.joined += 1
+        return future
+      self.waiting[query] = [(future, time.perf_counter())]
+    self.queue.put(query)
+    return future
+
+  def dispatch(self):
+    while True:
+      self.free.acquire()
+      query = self.queue.get()
+      if query is None:
+        return
+      with self.lock:
+        self.inflight += 1
+        self.searches += 1
+      started = time.perf_counter()
+      future = self.pool.submit(suggestmoves, [query], random.getrandbits(32), self.rolloutpolicy)
+      future.add_done_callback(lambda done, query = query, started = started: self.finish(done, query, started))
+
+  def finish(self, done, query, started):
+    self.free.release()
+    try:
+      result = done.result()[0]
+    except Exception as error:
+      logger.exception("move search failed")
+      result = {"error": "search failed: {}".format(error)}
+    finished = time.perf_counter()
+    with self.lock:
+      self.inflight -= 1
+      waiters = self.waiting.pop(query)
+      for future, received in waiters:
+        self.served += 1
+        self.errors += "error" in result
+        self.latencies.append(1000 * (finished - received))
+        # requests that joined a running search did not wait for a worker
+        self.waits.append(1000 * max(0, started - received))
+    for future, received in waiters:
+      future.set_result(dict(result))
+
+  def stats(self):
+    with self.lock:
+      return {
+        "queued": self.queue.qsize(),
+        "inflight": self.inflight,
+        "workers": self.workers,
+        "served": self.served,
+        "searches": self.searches,
+        "joined": self.joined,
+        "errors": self.errors,
+        "uptime": round(time.perf_counter() - self.started, 1),
+        "latencyms": percentiles(list(self.latencies)),
+        "queuedms": percentiles(list(self.waits)),
+      }
+
+  def shutdown(self):
+    self.queue.put(None)
+    self.dispatcher.join()
+    self.pool.shutdown(cancel_futures = True)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+  # answers the requests of one connection in the order they arrive
+  def handle(self):
+    for line in self.rfile:
+      if not line.strip():
+        continue
+      try:
+        message = json.loads(line)
+        if not isinstance(message, dict):
+          raise ValueError("a request must be a JSON object")
+      except ValueError as error:
+        response = {"error": "bad request: {}".format(error)}
+      else:
+        response = self.server.service.request(message).result()
+        if "id" in message:
+          response["id"] = message["id"]
+      self.wfile.write(json.dumps(response).encode() + b"\n")
+      self.wfile.flush()
+
+
+class TCPServer(socketserver.ThreadingTCPServer):
+  daemon_threads = True
+  allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+  class UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def makeserver(service, address):
+  # a socket server for service on a (host, port) pair or a Unix socket path
+  if isinstance(address, str):
+    if os.path.exists(address):
+      os.unlink(address)
+    server = UnixServer(address, RequestHandler)
+  else:
+    server = TCPServer(tuple(address), RequestHandler)
+  server.service = service
+  return server
+
+
+class MoveClient():
+  # blocking client for a MoveService over TCP or a Unix socket
+  def __init__(self, address, timeout = None):
+    if isinstance(address, str):
+      self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+      self.socket.settimeout(timeout)
+      self.socket.connect(address)
+    else:
+      self.socket = socket.create_connection(tuple(address), timeout)
+    self.file = self.socket.makefile("rwb")
+
+  def call(self, message):
+    self.file.write(json.dumps(message).encode() + b"\n")
+    self.file.flush()
+    line = self.file.readline()
+    if not line:
+      raise ConnectionError("the move server closed the connection")
+    return json.loads(line)
+
+  def suggest(self, board, milliseconds = None, iterations = None):
+    # the suggested move for board as (row, col)
+    message = {"boardsize": board.boardsize, "winlinelen": board.winlinelen, "numplayers": board.numplayers,
+               "positions": board.playerarray().tolist(), "turnnum": board.turnnum}
+    if milliseconds is not None:
+      message["milliseconds"] = milliseconds
+    if iterations is not None:
+      message["iterations"] = iterations
+    response = self.call(message)
+    if "error" in response:
+      raise ValueError(response["error"])
+    return tuple(response["move"])
+
+  def stats(self):
+    return self.call({"command": "stats"})
+
+  def close(self):
+    self.file.close()
+    self.socket.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
+
+
+def main(argv = None):
+  parser = argparse.ArgumentParser(prog = "python -m noughts.server", description = "Serve UCT move suggestions to local processes.")
+  parser.add_argument("--unix", help = "listen on this Unix socket path instead of TCP")
+  parser.add_argument("--host", default = "127.0.0.1")
+  parser.add_argument("--port", type = int, default = 8765)
+  parser.add_argument("--workers", type = int, default = None, help = "worker processes, default one per core")
+  parser.add_argument("--maxms", type = float, default = 10000, help = "largest time budget a request may ask for")
+  parser.add_argument("--table", type = int, default = 2 ** 16, help = "transposition table entries per worker")
+  parser.add_argument("--rollouts", choices = rolloutpolicies, default = "threat", help = "rollout policy")
+  args = parser.parse_args(argv)
+  logging.basicConfig(level = logging.INFO, format = "%(asctime)s %(message)s")
+
+  service = MoveService(args.workers, args.table, args.maxms, args.rollouts)
+  server = makeserver(service, args.unix or (args.host, args.port))
+  logger.info("serving moves on %s with %d workers", args.unix or "{}:{}".format(args.host, args.port), service.workers)
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+    service.shutdown()
+    if args.unix and os.path.exists(args.unix):
+      os.unlink(args.unix)
+
+
+if __name__  ==  "__main__":
+  main()
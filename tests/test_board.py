@@ -0,0 +1,50 @@
+import random
+
+import numpy as np
+import pytest
+
+from noughts.board import BitBoard, GameBoard, gamevariables
+
+
+configs = [(boardsize, winlinelen, numplayers) for boardsize in range(3, 8) for winlinelen in range(2, min(boardsize, 8) + 1)
+           for numplayers in range(2, 9)]
+
+
+def hasline(players, winlinelen, player):
+  # brute force: any run of winlinelen stones of player along a row, a
+  # column or either diagonal
+  boardsize = len(players)
+  for row in range(0, boardsize):
+    for col in range(0, boardsize):
+      for rowstep, colstep in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        cells = [(row + i * rowstep, col + i * colstep) for i in range(0, winlinelen)]
+        if all(0 <= r < boardsize and 0 <= c < boardsize and players[r][c]  ==  player for r, c in cells):
+          return True
+  return False
+
+
+@pytest.mark.parametrize("boardsize, winlinelen, numplayers", configs)
+def test_backends_agree_with_brute_force(boardsize, winlinelen, numplayers):
+  generator = random.Random("{} {} {}".format(boardsize, winlinelen, numplayers))
+  variables = gamevariables(boardsize, winlinelen, numplayers)
+  stringboard = GameBoard(variables)
+  bitboard = BitBoard(variables)
+  players = [[0] * boardsize for i in range(0, boardsize)]
+  winner = 0
+  while bitboard.endgame() < 0:
+    assert sorted(zip(*stringboard.availablepositions())) == sorted(zip(*bitboard.availablepositions()))
+    row, col = generator.choice(list(zip(*bitboard.availablepositions())))
+    player = bitboard.playernum(bitboard.turnnum)
+    stringboard.makenextplay((row, col))
+    bitboard.makenextplay((row, col))
+    players[row][col] = player
+    if not winner and hasline(players, winlinelen, player):
+      winner = player
+    expected = winner if winner else 0 if all(all(row) for row in players) else -1
+    assert stringboard.endgame() == expected
+    assert bitboard.endgame() == expected
+    assert stringboard.fullcheck() == expected
+    assert np.array_equal(stringboard.playerarray(), np.array(players))
+    assert np.array_equal(bitboard.playerarray(), np.array(players))
+    assert stringboard.zobrist == bitboard.zobrist
+    assert stringboard.emptycells == bitboard.emptycells
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from noughts.board import BitBoard, gamevariables
+from noughts.book import openingbook
+from noughts.bookgen import Solver, bookconfigs
+
+
+def keymasks(key, boardsize):
+  # the two player masks of a base 3 positionkey, cell 0 lowest
+  masks = [0, 0]
+  for cell in range(0, boardsize ** 2):
+    key, player = divmod(key, 3)
+    if player:
+      masks[player - 1] |= 1 << cell
+  return masks
+
+
+def boardmasks(board):
+  masks = [0, 0]
+  for playerindex, cell in board.stones():
+    masks[playerindex] |= 1 << cell
+  return masks[board.turnnum], masks[1 - board.turnnum]
+
+
+# solving 4x4 line 4 from a nearly empty board takes over a minute, so
+# the lookup checks there start a few stones in
+minplies = {(4, 4): 6}
+
+
+@pytest.mark.parametrize("boardsize, winlinelen", bookconfigs)
+def test_book_values_and_moves_match_the_solver(boardsize, winlinelen):
+  book = openingbook(boardsize, winlinelen)
+  assert book is not None and len(book) > 0
+  solver = Solver(boardsize, winlinelen)
+  generator = random.Random(boardsize * 10 + winlinelen)
+  for index in generator.sample(range(0, len(book)), min(len(book), 300)):
+    masks = keymasks(int(book.keys[index]), boardsize)
+    # the player to move has no more stones than the other
+    moverindex = 0 if bin(masks[0]).count("1")  ==  bin(masks[1]).count("1") else 1
+    mover, opponent = masks[moverindex], masks[1 - moverindex]
+    value = solver.solve(mover, opponent)
+    assert value == book.values[index]
+    cell = int(book.moves[index])
+    assert not (mover | opponent) >> cell & 1
+    after = 1 if solver.completes(mover, cell) else -solver.solve(opponent, mover | 1 << cell)
+    assert after == value
+
+
+@pytest.mark.parametrize("boardsize, winlinelen", bookconfigs)
+def test_book_lookup_keeps_the_value_in_every_orientation(boardsize, winlinelen):
+  # the book plays one side against random moves, which turn the board to
+  # every orientation; each book move has to keep the position's value
+  book = openingbook(boardsize, winlinelen)
+  solver = Solver(boardsize, winlinelen)
+  generator = random.Random(boardsize * 100 + winlinelen)
+  looked = 0
+  for game in range(0, 30):
+    board = BitBoard(gamevariables(boardsize, winlinelen, 2))
+    bookplayer = game % 2
+    while board.endgame() < 0:
+      move = book.lookup(board) if board.turnnum  ==  bookplayer else None
+      if move is None:
+        # lost positions are left out of the book, and nothing after one
+        # is in it
+        if board.turnnum  ==  bookplayer:
+          assert len(board.moves) < minplies.get((boardsize, winlinelen), 0) or solver.solve(*boardmasks(board)) == -1
+          break
+        move = generator.choice(list(zip(*board.availablepositions())))
+      elif len(board.moves) >= minplies.get((boardsize, winlinelen), 0):
+        looked += 1
+        mover, opponent = boardmasks(board)
+        cell = move[0] * boardsize + move[1]
+        assert not (mover | opponent) >> cell & 1
+        after = 1 if solver.completes(mover, cell) else -solver.solve(opponent, mover | 1 << cell)
+        assert after == solver.solve(mover, opponent) >= 0
+      board.makenextplay(move)
+  assert looked > 0
@@ -0,0 +1,36 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from noughts.board import BitBoard, gamevariables
+from noughts.evaluate import batchendgame
+
+
+def randomstack(boardsize, winlinelen, count, generator):
+  # boards from random games stopped at a random ply or at their end,
+  # with their endgame()
+  positions = np.zeros((count, boardsize, boardsize), dtype = np.int8)
+  endgames = np.zeros(count, dtype = np.int8)
+  for index in range(0, count):
+    board = BitBoard(gamevariables(boardsize, winlinelen, generator.randrange(2, 5)))
+    for ply in range(0, generator.randrange(0, boardsize ** 2 + 1)):
+      if board.endgame() >= 0:
+        break
+      board.makenextplay(generator.choice(list(zip(*board.availablepositions()))))
+    positions[index] = board.playerarray()
+    endgames[index] = board.endgame()
+  return positions, endgames
+
+
+# winning lines longer than the board are left in: nobody can win there
+@pytest.mark.parametrize("boardsize, winlinelen", [(boardsize, winlinelen) for boardsize in range(3, 8) for winlinelen in range(2, 9)])
+def test_batch_endgame_matches_endgame(boardsize, winlinelen, tmp_path):
+  generator = random.Random(boardsize * 10 + winlinelen)
+  positions, endgames = randomstack(boardsize, winlinelen, 40, generator)
+  # a chunk size that does not divide the stack leaves a short last chunk
+  assert np.array_equal(batchendgame(positions, winlinelen, chunksize = 7), endgames)
+  path = os.path.join(str(tmp_path), "positions.npy")
+  np.save(path, positions)
+  assert np.array_equal(batchendgame(path, winlinelen, chunksize = 7), endgames)
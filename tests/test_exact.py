@@ -0,0 +1,78 @@
+import random
+
+import numpy as np
+import pytest
+
+from noughts.board import BitBoard, gamevariables
+from noughts.bookgen import Solver
+from noughts.exact import ExactSearch
+from noughts.search import SearchBudget, exactfits
+
+
+# solving 4x4 line 4 from a nearly empty board takes over a minute, so
+# the checks there start a few stones in
+minplies = {(4, 4): 6}
+
+
+def randomboard(boardsize, winlinelen, generator):
+  # a two player position nobody has won yet
+  board = BitBoard(gamevariables(boardsize, winlinelen, 2))
+  for ply in range(0, generator.randrange(minplies.get((boardsize, winlinelen), 0), boardsize ** 2)):
+    trial = board.clone()
+    trial.makenextplay(generator.choice(list(zip(*board.availablepositions()))))
+    if trial.endgame() >= 0:
+      break
+    board = trial
+  return board
+
+
+def boardmasks(board):
+  masks = [0, 0]
+  for playerindex, cell in board.stones():
+    masks[playerindex] |= 1 << cell
+  return masks[board.turnnum], masks[1 - board.turnnum]
+
+
+@pytest.mark.parametrize("boardsize, winlinelen", [(3, 3), (4, 3), (4, 4)])
+def test_exact_search_matches_the_solver(boardsize, winlinelen):
+  solver = Solver(boardsize, winlinelen)
+  exact = ExactSearch(boardsize, winlinelen)
+  generator = random.Random(boardsize * 1000 + winlinelen)
+  for game in range(0, 40):
+    board = randomboard(boardsize, winlinelen, generator)
+    if board.endgame() >= 0:
+      continue
+    mover, opponent = boardmasks(board)
+    move, score, solved = exact.search(board, SearchBudget(iterations = 10 ** 7))
+    assert solved
+    assert np.sign(score) == solver.solve(mover, opponent)
+    cell = move[0] * boardsize + move[1]
+    after = 1 if solver.completes(mover, cell) else -solver.solve(opponent, mover | 1 << cell)
+    assert after == solver.solve(mover, opponent)
+
+
+def test_exact_memo_stays_under_its_limit():
+  exact = ExactSearch(4, 4)
+  exact.memolimit = 1000
+  board = BitBoard(gamevariables(4, 4, 2))
+  board.makenextplay((1, 1))
+  exact.search(board, SearchBudget(iterations = 50000))
+  assert 0 < len(exact.memo) <= exact.memolimit
+
+
+def test_exact_search_runs_only_where_it_can_solve():
+  # no segment fits on the board, so it is a draw the search can not prune
+  assert not exactfits(BitBoard(gamevariables(4, 5, 2)), SearchBudget(milliseconds = 2000))
+  # every segment of 3x3 holds stones of both players
+  board = BitBoard(gamevariables(3, 3, 2))
+  for move in ((0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0)):
+    board.makenextplay(move)
+  assert board.endgame() < 0
+  assert not exactfits(board, SearchBudget(milliseconds = 2000))
+  # more time lets it take on more empty cells
+  board = BitBoard(gamevariables(4, 4, 2))
+  board.makenextplay((0, 0))
+  board.makenextplay((1, 1))
+  assert not exactfits(board, SearchBudget(milliseconds = 500))
+  assert exactfits(board, SearchBudget(milliseconds = 4000))
+  assert not exactfits(BitBoard(gamevariables(3, 3, 3)), SearchBudget(milliseconds = 2000))
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from noughts.host import MatchHost
+
+
+@pytest.fixture(scope = "module")
+def matchhost():
+  matchhost = MatchHost(workers = 2, tablesize = 2 ** 10)
+  yield matchhost
+  matchhost.shutdown()
+
+
+def test_held_long_move_is_searched_once_it_turns_quick(matchhost):
+  # with two workers one long search takes all the long moves may have,
+  # so the second long move waits until it is due within quickmilliseconds
+  async def play():
+    matchhost.scheduler = None
+    slow = matchhost.newmatch(7, 4, milliseconds = 3000)
+    held = matchhost.newmatch(7, 4, milliseconds = 800)
+    loop = asyncio.get_running_loop()
+    first = loop.create_task(matchhost.aimove(slow))
+    await asyncio.sleep(0.05)
+    start = loop.time()
+    move = await matchhost.aimove(held)
+    latency = loop.time() - start
+    await first
+    return move, latency
+  move, latency = asyncio.run(play())
+  assert len(move) == 2
+  # unheld it would wait for the 3000ms search to end
+  assert latency < 2
+
+
+def test_each_move_is_answered_when_its_own_search_ends():
+  # queued together on one worker, the earlier move must not wait for the
+  # later one's search
+  matchhost = MatchHost(workers = 1, tablesize = 2 ** 10)
+
+  async def play():
+    loop = asyncio.get_running_loop()
+    quick = matchhost.newmatch(5, 4, milliseconds = 40)
+    later = matchhost.newmatch(5, 4, milliseconds = 240)
+    start = loop.time()
+    answered = {}
+
+    async def timed(match):
+      await matchhost.aimove(match)
+      answered[match.matchid] = loop.time() - start
+    await asyncio.gather(timed(quick), timed(later))
+    return answered[quick.matchid], answered[later.matchid]
+  try:
+    quicklatency, laterlatency = asyncio.run(play())
+  finally:
+    matchhost.shutdown()
+  assert quicklatency < 0.1
+  assert quicklatency < laterlatency < 1
+
+
+def test_bad_move_payload_gets_an_error_and_the_match_goes_on(matchhost, tmp_path):
+  path = os.path.join(str(tmp_path), "host.sock")
+
+  async def play():
+    matchhost.scheduler = None
+    server = await asyncio.start_unix_server(matchhost.handle, path)
+    reader, writer = await asyncio.open_unix_connection(path)
+
+    async def call(message):
+      writer.write(json.dumps(message).encode() + b"\n")
+      await writer.drain()
+      return json.loads(await asyncio.wait_for(reader.readline(), 30))
+
+    state = await call({"command": "play", "boardsize": 3, "winlinelen": 3, "humans": 1, "milliseconds": 50})
+    assert state["yourturn"]
+    replies = [await call({"match": state["match"], "move": [1]}), await call({"match": state["match"], "move": [1, 1, 1]})]
+    # the AI may have the first seat
+    cell = next(divmod(cell, 3) for cell in range(0, 9) if not state["positions"][cell // 3][cell % 3])
+    after = await call({"match": state["match"], "move": list(cell)})
+    writer.close()
+    await writer.wait_closed()
+    await asyncio.sleep(0.1)
+    server.close()
+    await server.wait_closed()
+    return replies, after, cell, state["turnnum"]
+  replies, after, cell, turnnum = asyncio.run(play())
+  assert all("error" in reply for reply in replies)
+  assert "error" not in after and after["positions"][cell[0]][cell[1]]  ==  turnnum + 1
@@ -0,0 +1,17 @@
+import random
+
+from noughts.board import BitBoard, GameBoard, gamevariables
+
+
+def test_large_board_candidates_match_the_string_board():
+  generator = random.Random(9)
+  variables = gamevariables(11, 5, 2)
+  stringboard = GameBoard(variables)
+  bitboard = BitBoard(variables)
+  for ply in range(0, 30):
+    assert sorted(zip(*stringboard.candidatepositions())) == sorted(zip(*bitboard.candidatepositions()))
+    move = generator.choice(list(zip(*bitboard.availablepositions())))
+    stringboard.makenextplay(move)
+    bitboard.makenextplay(move)
+    if bitboard.endgame() >= 0:
+      break
@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+
+from noughts.board import BitBoard, gamevariables
+from noughts.records import GameLog, appendgames, headersize, recordgame, replay, summarise
+
+
+def randomgame(boardsize, winlinelen, numplayers, generator):
+  board = BitBoard(gamevariables(boardsize, winlinelen, numplayers))
+  board.humanturnnums = np.array(sorted(generator.sample(range(0, numplayers), generator.randrange(0, numplayers + 1))))
+  while board.endgame() < 0:
+    board.makenextplay(generator.choice(list(zip(*board.availablepositions()))))
+  return board
+
+
+def test_empty_log(tmp_path):
+  path = tmp_path / "games.bin"
+  path.write_bytes(b"")
+  log = GameLog(str(path))
+  assert len(log) == 0
+  assert list(log) == []
+  assert log.movearray().shape == (0, 0)
+  assert list(log.chunks()) == []
+  assert summarise(log) == {}
+
+
+def test_games_round_trip(tmp_path):
+  path = str(tmp_path / "games.bin")
+  generator = random.Random(4)
+  boards = [randomgame(boardsize, winlinelen, numplayers, generator)
+            for boardsize, winlinelen, numplayers in [(3, 3, 2), (4, 3, 3), (7, 4, 2), (5, 4, 8)] for i in range(0, 5)]
+  for board in boards:
+    recordgame(path, board, timestamp = 1234)
+  log = GameLog(path)
+  assert len(log) == len(boards)
+  moves = log.movearray()
+  for index, (board, game) in enumerate(zip(boards, log)):
+    assert game["boardsize"] == board.boardsize
+    assert game["winlinelen"] == board.winlinelen
+    assert game["numplayers"] == board.numplayers
+    assert game["winner"] == board.endgame()
+    assert game["humanturnnums"] == board.humanturnnums.tolist()
+    assert game["moves"] == board.moves
+    assert game["time"] == 1234
+    assert [divmod(int(cell), board.boardsize) for cell in moves[index] if cell >= 0] == board.moves
+    replayed = replay(game)
+    assert np.array_equal(replayed.playerarray(), board.playerarray())
+    assert replayed.endgame() == board.endgame()
+
+
+def test_truncated_last_game_is_skipped(tmp_path):
+  path = tmp_path / "games.bin"
+  generator = random.Random(5)
+  boards = [randomgame(4, 3, 2, generator) for i in range(0, 3)]
+  for board in boards:
+    recordgame(str(path), board)
+  data = path.read_bytes()
+  for cut in (1, len(boards[-1].moves), len(boards[-1].moves) + headersize - 1):
+    path.write_bytes(data[:-cut])
+    log = GameLog(str(path))
+    assert len(log) == 2
+    assert [game["moves"] for game in log] == [board.moves for board in boards[:2]]
+
+
+def test_wide_moves_on_large_boards(tmp_path):
+  # 19x19 has more than 256 cells, so moves take two bytes
+  path = str(tmp_path / "games.bin")
+  moves = [(18, 18), (0, 0), (9, 9), (17, 3), (14, 15), (18, 0), (0, 18)]
+  games = [
+    {"boardsize": 3, "winlinelen": 3, "numplayers": 2, "winner": 1, "humanturnnums": [0], "moves": [(0, 0), (1, 1), (0, 1), (2, 2), (0, 2)]},
+    {"boardsize": 19, "winlinelen": 5, "numplayers": 2, "winner": 0, "humanturnnums": [], "moves": moves},
+    {"boardsize": 17, "winlinelen": 5, "numplayers": 3, "winner": 2, "humanturnnums": [1, 2], "moves": [(16, 16), (16, 0)]},
+  ]
+  appendgames(path, games)
+  log = GameLog(path)
+  assert log.headers["movebytes"].tolist() == [1, 2, 2]
+  for index, game in enumerate(games):
+    assert log[index]["moves"] == game["moves"]
+    assert log[index]["humanturnnums"] == game["humanturnnums"]
+  cells = log.movearray()
+  assert cells.shape == (3, len(moves))
+  assert cells[1].tolist() == [row * 19 + col for row, col in moves]
+  assert cells[2].tolist() == [288, 272] + [-1] * (len(moves) - 2)
+  chunks = list(log.chunks(2))
+  assert [headers.size for headers, chunk in chunks] == [2, 1]
+  assert chunks[0][1][1].tolist() == cells[1].tolist()
+  assert chunks[1][1].tolist() == [[288, 272]]
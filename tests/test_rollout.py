@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from noughts.board import BitBoard, gamevariables
+from noughts.rollout import threatrollout
+
+
+def playedboard(boardsize, winlinelen, moves, numplayers = 2):
+  board = BitBoard(gamevariables(boardsize, winlinelen, numplayers))
+  for move in moves:
+    board.makenextplay(move)
+  assert board.endgame() < 0
+  return board
+
+
+# the first player, to move, has three or four in a row with one cell to
+# complete it; on the small board the second player has a threat too
+wins = [
+  (5, 4, [(0, 0), (4, 0), (0, 1), (4, 1), (0, 2), (4, 2)]),
+  (11, 5, [(5, 2), (5, 1), (5, 3), (0, 10), (5, 4), (10, 0), (5, 5), (0, 5)]),
+]
+
+
+@pytest.mark.parametrize("boardsize, winlinelen, moves", wins)
+def test_threat_rollout_takes_an_immediate_win(boardsize, winlinelen, moves):
+  random.seed(0)
+  board = playedboard(boardsize, winlinelen, moves)
+  for i in range(0, 50):
+    # one ply is all the first player gets
+    assert threatrollout(board, 1) == [0, 1, 0]
+
+
+# the same threats, with the second player to move and no win of their own
+blocks = [
+  (5, 4, [(0, 0), (4, 0), (0, 1), (4, 4), (0, 2)]),
+  (11, 5, [(5, 2), (5, 1), (5, 3), (0, 10), (5, 4), (10, 0), (5, 5)]),
+]
+
+
+@pytest.mark.parametrize("boardsize, winlinelen, moves", blocks)
+def test_threat_rollout_blocks_the_next_opponent(boardsize, winlinelen, moves):
+  # without the block the first player would win on the second ply
+  random.seed(1)
+  board = playedboard(boardsize, winlinelen, moves)
+  for i in range(0, 50):
+    assert threatrollout(board, 2) == [1, 0, 0]
+
+
+@pytest.mark.parametrize("boardsize, winlinelen, numplayers", [(3, 3, 2), (5, 4, 2), (6, 4, 3), (11, 5, 2), (13, 5, 3)])
+def test_threat_rollout_results_are_one_hot(boardsize, winlinelen, numplayers):
+  generator = random.Random(boardsize * 10 + numplayers)
+  random.seed(boardsize)
+  for game in range(0, 20):
+    board = BitBoard(gamevariables(boardsize, winlinelen, numplayers))
+    for ply in range(0, generator.randrange(0, 2 * boardsize)):
+      if board.endgame() >= 0:
+        break
+      board.makenextplay(generator.choice(list(zip(*board.availablepositions()))))
+    stones = list(board.stones())
+    results = threatrollout(board, 8 * boardsize if board.largeboard else None)
+    assert len(results) == numplayers + 1
+    assert sorted(results) == [0] * numplayers + [1]
+    if board.endgame() >= 0:
+      assert results[board.endgame()] == 1
+    # the rollout plays on its own counts and leaves the board alone
+    assert list(board.stones()) == stones
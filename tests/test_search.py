@@ -0,0 +1,102 @@
+import random
+
+from noughts import search
+from noughts.board import BitBoard, gamevariables
+from noughts.search import SearchBudget
+
+
+def visits(statistics):
+  return sum(visits for visits, wins in statistics.values())
+
+
+def test_repeated_tasks_of_one_search_return_only_new_statistics():
+  random.seed(0)
+  board = BitBoard(gamevariables(5, 4, 2))
+  board.makenextplay((2, 2))
+  budget = SearchBudget(iterations = 5)
+  first, stats = search.rootstatistics(board, budget, 1, 1, searchid = 7)
+  second, stats = search.rootstatistics(board, budget, 1, 2, searchid = 7)
+  assert visits(first) == 5
+  assert visits(second) == 5
+  # a new search on the same tree reports everything it holds
+  third, stats = search.rootstatistics(board, budget, 1, 3, searchid = 8)
+  assert visits(third) == 15
+
+
+def test_parallel_search_takes_an_iteration_count():
+  pool = search.ParallelUCT(workers = 2, usebook = False, useexact = False)
+  try:
+    board = BitBoard(gamevariables(5, 4, 2))
+    move = pool.search(board, 20)
+    assert board.positions[move] == board.gametokens[0]
+    assert pool.submit(board, 20).result() in list(zip(*board.availablepositions()))
+  finally:
+    pool.shutdown()
+
+
+def test_tree_reuse_survives_symmetric_replies_in_the_opening():
+  # only the root collapses symmetric moves, so every reply to the chosen
+  # move is in the tree and re-rooting keeps its statistics
+  random.seed(1)
+  board = BitBoard(gamevariables(5, 4, 2))
+  tree = search.SearchTree()
+  move = search.UCTsearch(board, SearchBudget(iterations = 2000), tree = tree).bestaction()
+  store = tree.store
+  child = [node for node in store.children(tree.root) if divmod(int(store.action[node]), 5)  ==  move][0]
+  assert store.numchildren[child] == board.emptycells - 1
+  board.makenextplay(move)
+  replied = board.clone()
+  replied.makenextplay(divmod(int(store.action[store.children(child)][-1]), 5))
+  visits = store.visits[store.stat[store.children(child)[-1]]]
+  root = tree.rootfor(replied)
+  assert tree.store.visits[tree.store.stat[root]] == visits
+
+
+def test_table_follows_statistics_moved_by_compaction():
+  # re-rooting drops the holders of some shared statistics; the table has
+  # to point at the kept node they moved to, or the next transposition to
+  # that position starts over
+  checked = 0
+  for seed in range(0, 5):
+    random.seed(seed)
+    board = BitBoard(gamevariables(3, 3, 2))
+    tree = search.SearchTree()
+    table = search.TranspositionTable(2 ** 20)
+    move = search.UCTsearch(board, SearchBudget(iterations = 3000), tree = tree, table = table).bestaction()
+    board.makenextplay(move)
+    root = tree.rootfor(board, table)
+    store = tree.store
+    boards = [(root, board)]
+    while boards:
+      node, nodeboard = boards.pop()
+      for child in store.children(node):
+        childboard = nodeboard.clone()
+        childboard.makenextplay(divmod(int(store.action[child]), 3))
+        key = childboard.cachekey()
+        if int(table.keys[key % table.size])  ==  key:
+          resident = table.nodes[key % table.size]
+          assert resident >= 0 and store.stat[resident] == resident
+          checked += 1
+        boards.append((child, childboard))
+  assert checked > 0
+
+
+def test_instrumented_searches_return_stats_for_every_move():
+  pool = search.ParallelUCT(workers = 1, instrument = True)
+  try:
+    board = BitBoard(gamevariables(3, 3, 2))
+    move, stats = pool.search(board, SearchBudget(milliseconds = 100))
+    assert stats.stoppedby == "book" and stats.iterations == 0
+    board = BitBoard(gamevariables(5, 4, 2))
+    move, stats = pool.search(board, 20)
+    assert stats.stoppedby == "iterations" and stats.iterations == 20
+    assert stats.elapsed >= stats.shortcuttime
+  finally:
+    pool.shutdown()
+  # an exact search that runs out of budget still counts its time
+  board = BitBoard(gamevariables(4, 4, 2))
+  for move in ((0, 0), (1, 1), (2, 2), (0, 3)):
+    board.makenextplay(move)
+  move, stats = search.UCT(board, SearchBudget(iterations = 200), instrument = True, usebook = False)
+  assert stats.stoppedby == "iterations"
+  assert 0 < stats.shortcuttime < stats.elapsed
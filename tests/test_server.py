@@ -0,0 +1,109 @@
+import os
+import random
+import threading
+
+import numpy as np
+import pytest
+
+from noughts.board import BitBoard, gamevariables
+from noughts.server import MoveClient, MoveService, makeserver, parsequery, queryboard
+
+
+def message(board, **budget):
+  return dict({"boardsize": board.boardsize, "winlinelen": board.winlinelen, "numplayers": board.numplayers,
+               "positions": board.playerarray().tolist(), "turnnum": board.turnnum}, **budget)
+
+
+setterconfigs = [(boardsize, winlinelen, numplayers) for boardsize in range(3, 8) for winlinelen in range(2, boardsize + 1)
+                 for numplayers in range(2, 9)][::3]
+
+
+@pytest.mark.parametrize("boardsize, winlinelen, numplayers", setterconfigs)
+def test_queryboard_rebuilds_the_board(boardsize, winlinelen, numplayers):
+  # the server builds boards from a grid of player numbers and a turn
+  generator = random.Random("setter {} {} {}".format(boardsize, winlinelen, numplayers))
+  for game in range(0, 5):
+    board = BitBoard(gamevariables(boardsize, winlinelen, numplayers))
+    for ply in range(0, generator.randrange(0, boardsize ** 2 + 1)):
+      if board.endgame() >= 0:
+        break
+      board.makenextplay(generator.choice(list(zip(*board.availablepositions()))))
+    query = (boardsize, winlinelen, numplayers, tuple(board.playerarray().ravel().tolist()), board.turnnum)
+    rebuilt = queryboard(query)
+    assert np.array_equal(rebuilt.playerarray(), board.playerarray())
+    assert rebuilt.masks == board.masks
+    assert rebuilt.occupied == board.occupied
+    assert rebuilt.zobrist == board.zobrist
+    assert rebuilt.emptycells == board.emptycells
+    assert rebuilt.endgame() == board.endgame()
+    assert sorted(zip(*rebuilt.availablepositions())) == sorted(zip(*board.availablepositions()))
+
+
+def test_every_query_has_a_time_limit():
+  board = BitBoard(gamevariables(3, 3, 2))
+  # an iteration count only stops a search sooner
+  assert parsequery(message(board, iterations = 10 ** 12), 500)[5:] == (500, 10 ** 12)
+  assert parsequery(message(board, milliseconds = 200, iterations = 50), 500)[5:] == (200, 50)
+  with pytest.raises(ValueError):
+    parsequery(message(board, milliseconds = 600), 500)
+
+
+@pytest.fixture(scope = "module")
+def service():
+  service = MoveService(workers = 1, tablesize = 2 ** 10)
+  yield service
+  service.shutdown()
+
+
+def test_requests_are_answered_one_search_each(service):
+  boards = []
+  for cell in range(0, 3):
+    board = BitBoard(gamevariables(5, 4, 2))
+    board.makenextplay((cell, 0))
+    boards.append(board)
+  futures = [service.request(message(board, milliseconds = 150)) for board in boards]
+  for board, future in zip(boards, futures):
+    move = tuple(future.result(timeout = 30)["move"])
+    assert board.playerarray()[move] == 0
+  # each request is answered when its own search ends, not with the others
+  latencies = sorted(service.latencies)[-3:]
+  assert latencies[1] - latencies[0] > 100 and latencies[2] - latencies[1] > 100
+
+
+def test_identical_requests_share_a_search(service):
+  board = BitBoard(gamevariables(4, 3, 3))
+  board.makenextplay((1, 1))
+  searches = service.stats()["searches"]
+  futures = [service.request(message(board, milliseconds = 100)) for i in range(0, 4)]
+  moves = [tuple(future.result(timeout = 30)["move"]) for future in futures]
+  assert len(set(moves)) == 1
+  assert service.stats()["searches"] == searches + 1
+
+
+def test_bad_and_finished_positions_get_errors(service):
+  assert "error" in service.request({"boardsize": 3}).result(timeout = 30)
+  board = BitBoard(gamevariables(3, 3, 2))
+  for move in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+    board.makenextplay(move)
+  assert service.request(message(board, iterations = 10)).result(timeout = 30) == {"error": "the game is over"}
+
+
+def test_client_over_a_unix_socket(service, tmp_path):
+  path = str(tmp_path / "moves.sock")
+  server = makeserver(service, path)
+  thread = threading.Thread(target = server.serve_forever, daemon = True)
+  thread.start()
+  try:
+    board = BitBoard(gamevariables(3, 3, 2))
+    board.makenextplay((1, 1))
+    with MoveClient(path, timeout = 30) as client:
+      move = client.suggest(board, iterations = 50)
+      assert board.playerarray()[move] == 0
+      response = client.call({"id": 3, "boardsize": 3})
+      assert response["id"] == 3 and "error" in response
+      stats = client.stats()
+      assert stats["served"] >= 1 and stats["latencyms"]["p50"] is not None
+  finally:
+    server.shutdown()
+    server.server_close()
+    os.unlink(path)
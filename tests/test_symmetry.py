@@ -0,0 +1,11 @@
+import numpy as np
+
+from noughts.board import symmetries
+
+
+def test_symmetries_are_permutations():
+  for boardsize in range(2, 8):
+    transforms = symmetries(boardsize)
+    assert transforms.shape == (8, boardsize ** 2)
+    assert np.array_equal(transforms[0], np.arange(boardsize ** 2))
+    assert all(np.array_equal(np.sort(transform), np.arange(boardsize ** 2)) for transform in transforms)